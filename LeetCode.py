@@ -1,64 +1,195 @@
-import undetected_chromedriver as uc
-from selenium.webdriver import ChromeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.keys import Keys
-import pickle
 import os
 import time
+import sys
+import glob
+import shutil
 import subprocess
+from functools import lru_cache
 from dotenv import load_dotenv
-from datetime import datetime  
+from metrics import timed
+from judge_result import from_check, parse_result_text
+from cookie_store import CookieStore
 import requests
 import re
 import json
-import pyperclip
 
 load_dotenv()
 
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+CHROME_PATHS = [
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    os.path.expandvars(r"%ProgramFiles%\Google\Chrome\Application\chrome.exe"),
+    os.path.expandvars(r"%ProgramFiles(x86)%\Google\Chrome\Application\chrome.exe"),
+    os.path.expandvars(r"%LocalAppData%\Google\Chrome\Application\chrome.exe"),
+]
+
+# Panels LeetCode renders the run and submit verdicts in
+TEST_RESULT_PANEL = 'div[data-layout-path="/c1/ts1/t1"]'
+SUBMIT_RESULT_PANEL = 'div[data-layout-path="/ts0/t1"]'
+
+# Requests a solver never needs: images, fonts, media, analytics, ads and chat widgets
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*adservice.google.com*", "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*sentry.io*",
+    "*segment.io*", "*segment.com*", "*amplitude.com*", "*mixpanel.com*", "*intercom.io*", "*hm.baidu.com*",
+]
+
+
+@lru_cache(maxsize=None)
+def get_auth_client():
+    """
+    This function use to create the GraphQL client used for auth checks once per process,
+    so every session shares its cached answer.
+    """
+    from leetcode_graphql import LeetCodeGraphQLClient
+    return LeetCodeGraphQLClient()
+
+
+@lru_cache(maxsize=None)
+def find_chrome_binary():
+    """
+    This function use to locate the Chrome/Chromium executable once per process.
+
+    Returns:
+    str: path from CHROME_BINARY, PATH or the usual install locations, or None.
+    """
+    configured = os.getenv("CHROME_BINARY")
+    if configured:
+        return configured
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in CHROME_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _windows_chrome_version():
+    """Version from the registry (the executable has no usable --version on Windows)"""
+    for hive in ("HKEY_CURRENT_USER", "HKEY_LOCAL_MACHINE"):
+        try:
+            result = subprocess.run(
+                ["reg", "query", rf"{hive}\Software\Google\Chrome\BLBeacon", "/v", "version"],
+                capture_output=True, text=True, timeout=5
+            )
+            match = re.search(r"(\d+)\.\d+", result.stdout)
+            if match:
+                return match.group(0)
+        except (OSError, subprocess.SubprocessError):
+            continue
+    binary = find_chrome_binary()
+    if binary:
+        # The install folder holds a directory named after the version
+        for path in glob.glob(os.path.join(os.path.dirname(binary), "[0-9]*.*")):
+            return os.path.basename(path)
+    return None
+
+
+@lru_cache(maxsize=None)
+def chrome_major_version():
+    """
+    This function use to detect Chrome's major version once per process.
+
+    CHROME_VERSION_MAIN overrides the probe. On Linux and macOS the binary
+    is asked for its --version (no shell), on Windows the registry is read.
+
+    Returns:
+    int: major version, or None to let undetected_chromedriver detect it.
+    """
+    configured = os.getenv("CHROME_VERSION_MAIN")
+    if configured:
+        return int(configured)
+    try:
+        if sys.platform.startswith("win"):
+            version = _windows_chrome_version()
+        else:
+            binary = find_chrome_binary()
+            if not binary:
+                return None
+            version = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        match = re.search(r"(\d+)\.\d+", version or "")
+        return int(match.group(1)) if match else None
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        print(f"Chrome version check failed: {str(e)}")
+        return None
+
+
 class LeetCodeSessionManager:
     def __init__(self):
         self.driver = None
-        self.cookie_file = "leetcode_cookies.pkl"
+        self.base_url = os.getenv("LEETCODE_BASE_URL", "https://leetcode.com").rstrip("/")
+        self.cookie_store = CookieStore()
         self.credentials = {
             "email": os.getenv("LEETCODE_EMAIL"),
             "password": os.getenv("LEETCODE_PASSWORD")
         }
         self.max_wait = 15  # Seconds for element waits
+        self.created_at = None  # Set once the session is authenticated
+        self.uses = 0  # Number of runs served, tracked by the session pool
+        self.last_judge_result = None  # Raw check response of the latest run/submission
+        self.last_result = None  # JudgeResult parsed from the latest run/submission
+        # Headless browser that skips non-essential downloads; needs saved cookies to log in
+        self.lean = os.getenv("BROWSER_LEAN", "0") == "1"
 
     def create_driver(self):
         """Create Chrome driver with proper configuration"""
         try:
-            options = ChromeOptions()
+            # Imported here so importing this module (and the server) stays fast
+            import undetected_chromedriver as uc
+
+            options = uc.ChromeOptions()
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-gpu")
             options.add_argument("--log-level=3")
-            
-            return uc.Chrome(
+            # Network events let run/submit results be tied to their judge id
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            if self.lean:
+                options.add_argument("--window-size=1280,800")
+                options.add_argument("--disable-extensions")
+                options.add_argument("--disable-background-networking")
+                options.add_argument("--disable-component-update")
+                options.add_argument("--disable-default-apps")
+                options.add_argument("--disable-sync")
+                options.add_argument("--mute-audio")
+                options.add_argument("--blink-settings=imagesEnabled=false")
+                options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+
+            driver = uc.Chrome(
                 options=options,
-                version_main=self._get_chrome_major_version(),
+                version_main=chrome_major_version(),
+                browser_executable_path=find_chrome_binary(),
+                headless=self.lean,
                 auto_install=True,
                 use_subprocess=False,
                 suppress_welcome=True,
                 service_log_path=os.devnull
             )
+            if self.lean:
+                self._block_resources(driver)
+            return driver
         except Exception as e:
             print(f"Driver creation failed: {str(e)}")
             return None
 
-    def _get_chrome_major_version(self):
-        """Get Chrome's major version number"""
+    def _block_resources(self, driver):
+        """Drop requests for BLOCKED_URLS (plus BROWSER_BLOCKED_URLS) before they leave the browser"""
+        extra = [url.strip() for url in os.getenv("BROWSER_BLOCKED_URLS", "").split(",") if url.strip()]
         try:
-            result = subprocess.check_output(
-                r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
-                shell=True, stderr=subprocess.DEVNULL
-            ).decode()
-            return int(result.split()[-1].split('.')[0])
-        except:
-            return None  # Auto-detect if version check fails
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS + extra})
+        except Exception as e:
+            print(f"Resource blocking unavailable: {str(e)}")
 
+    @timed("selenium")
     def start_session(self):
         """Start and manage browser session"""
         try:
@@ -70,11 +201,17 @@ class LeetCodeSessionManager:
             
             # Try cookie-based authentication first
             if self._try_cookie_auth():
+                self.created_at = time.monotonic()
                 return True
                 
+            if self.lean:
+                print("Saved cookies are required in lean mode; run once with BROWSER_LEAN=0 to log in")
+                return False
+
             # Manual login for first time
             if self._manual_login():
                 self._save_cookies()
+                self.created_at = time.monotonic()
                 return True
                 
             return False
@@ -84,10 +221,11 @@ class LeetCodeSessionManager:
             self._safe_quit()
             return False
 
+    @timed("selenium")
     def _manual_login(self):
         """Handle manual login with user interaction"""
         try:
-            self.driver.get("https://leetcode.com/accounts/login/")
+            self.driver.get(f"{self.base_url}/accounts/login/")
             
             # Fill credentials automatically
             email_field = WebDriverWait(self.driver, self.max_wait).until(
@@ -112,16 +250,20 @@ class LeetCodeSessionManager:
             print(f"Manual login error: {str(e)}")
             return False
 
+    @timed("selenium")
     def _try_cookie_auth(self):
         """Attempt cookie authentication"""
-        if not os.path.exists(self.cookie_file):
+        cookies = self.cookie_store.load()
+        if not cookies:
             return False
-            
+
+        # Fast path: one (cached) userStatus call, cookies set over CDP, no page load
+        if get_auth_client().is_signed_in() and self._set_cookies_cdp(cookies):
+            return True
+
+        # Slow path: load the site, add the cookies, and look for the avatar
         try:
-            self.driver.get("https://leetcode.com")
-            with open(self.cookie_file, "rb") as f:
-                cookies = pickle.load(f)
-                
+            self.driver.get(self.base_url)
             for cookie in cookies:
                 if 'expiry' in cookie:
                     del cookie['expiry']
@@ -134,10 +276,33 @@ class LeetCodeSessionManager:
             print(f"Cookie auth failed: {str(e)}")
             return False
 
+    def _set_cookies_cdp(self, cookies):
+        """Install saved cookies for the LeetCode origin without navigating to it"""
+        params = []
+        for cookie in cookies:
+            param = {"name": cookie["name"], "value": cookie["value"], "path": cookie.get("path", "/"),
+                     "secure": cookie.get("secure", False), "httpOnly": cookie.get("httpOnly", False)}
+            if cookie.get("domain"):
+                param["domain"] = cookie["domain"]
+            else:
+                param["url"] = self.base_url
+            if cookie.get("expiry"):
+                param["expires"] = cookie["expiry"]
+            if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                param["sameSite"] = cookie["sameSite"]
+            params.append(param)
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+            return True
+        except Exception as e:
+            print(f"Setting cookies over CDP failed: {str(e)}")
+            return False
+
+    @timed("selenium")
     def _is_authenticated(self):
         """Verify authentication status"""
         try:
-            self.driver.get("https://leetcode.com/problemset/all/")
+            self.driver.get(f"{self.base_url}/problemset/all/")
             WebDriverWait(self.driver, self.max_wait).until(
             EC.presence_of_element_located((By.XPATH, "//span[contains(@id, 'navbar_user_avatar')]"))
         )
@@ -147,10 +312,24 @@ class LeetCodeSessionManager:
 
     def _save_cookies(self):
         """Save cookies for future sessions"""
-        with open(self.cookie_file, "wb") as f:
-            pickle.dump(self.driver.get_cookies(), f)
+        self.cookie_store.save(self.driver.get_cookies())
         print("Session cookies saved successfully")
 
+    def is_healthy(self):
+        """Cheap liveness check: browser responds and the login cookie is still present"""
+        try:
+            self.driver.execute_script("return document.readyState")
+            # Through CDP so it also works before the first LeetCode page is loaded
+            cookies = self.driver.execute_cdp_cmd("Network.getCookies", {"urls": [self.base_url]})["cookies"]
+            return any(cookie["name"] == "LEETCODE_SESSION" for cookie in cookies)
+        except Exception:
+            return False
+
+    def close(self):
+        """Shut down the browser of a session that was started without the context manager"""
+        self._safe_quit()
+        self.driver = None
+
     def _safe_quit(self):
         """Proper resource cleanup"""
         try:
@@ -168,80 +347,26 @@ class LeetCodeSessionManager:
         """Context manager exit"""
         self._safe_quit()
     
-    def get_daily_problem(self):
-        """Fetch today's daily problem with full URL"""
-        script = """
-        var callback = arguments[arguments.length - 1];
-        const query = {
-            "query": `query questionOfToday {
-                activeDailyCodingChallengeQuestion {
-                    link
-                    question {
-                        title
-                    }
-                }
-            }`
-        };
-        
-        fetch('https://leetcode.com/graphql', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'Referer': 'https://leetcode.com/'
-            },
-            body: JSON.stringify(query)
-        })
-        .then(response => response.json())
-        .then(data => callback(data))
-        .catch(error => callback({ error: error.message }));
-        """
-        
-        try:
-            result = self.driver.execute_async_script(script)
-            if 'error' in result:
-                print(f"API Error: {result['error']}")
-                return None
-                
-            base_link = result['data']['activeDailyCodingChallengeQuestion']['link']
-            title = result['data']['activeDailyCodingChallengeQuestion']['question']['title']
-            
-            # Construct full URL with description and date parameters
-            today_date = datetime.today().strftime('%Y-%m-%d')
-            full_url = f"https://leetcode.com{base_link}description/?envType=daily-question&envId={today_date}"
-            
-            return {
-                'url': full_url,
-                'title': title,
-                "base_link":base_link
-            }
-        except Exception as e:
-            print(f"Daily problem fetch failed: {str(e)}")
-            return None
-        
+    @timed("selenium")
     def select_python_language(self):
         """Select Python3 from the language dropdown"""
         try:
-            # Click the language selector button
-            # lang_button = WebDriverWait(self.driver, 15).until(
-            #     EC.element_to_be_clickable((By.XPATH, 
-            #         "//button[contains(@class, 'rounded') and contains(., 'C++')]"))
-            # )
-            # lang_button.click()
-            editor = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "inputarea"))
+            # The toolbar is rendered client-side after the page loads, so wait for the
+            # language button first; pooled sessions keep the language of the previous run
+            dropdown_button = WebDriverWait(self.driver, 15).until(
+                EC.element_to_be_clickable((By.XPATH,
+                    "//div[@id='editor']//button[contains(@class, 'rounded') and (contains(., 'Python3') or contains(., 'C++'))]"))
             )
-            self.driver.execute_script("arguments[0].click();", editor)
-            
+            if "Python3" in dropdown_button.text:
+                return True
 
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "inputarea"))
+            )
             # Clear existing code
-            editor.send_keys(Keys.CONTROL, "a")
-            editor.send_keys(Keys.DELETE)
+            self._set_editor_value("")
 
             # Click the language dropdown button
-            dropdown_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, 
-                    "//div[@id='editor']//button[contains(@class, 'rounded') and contains(., 'C++')]"))
-            )
             dropdown_button.click()
 
             # Select Python3 from the dropdown
@@ -266,92 +391,233 @@ class LeetCodeSessionManager:
             print(f"Language selection failed: {str(e)}")
             return False
 
-    def get_problem_details(self,slug):
-        """Extract problem details with improved reliability"""
-        try:
-            description = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "elfjS"))
-            ).text
-            # inputarea, view-lines 
-            python_code_template=WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "view-lines"))
-            ).text
-
-            print(python_code_template)
-            return {
-                    "description":description,
-                    "python_code_template":python_code_template
-                    }
+    def _set_editor_value(self, code):
+        """
+        Replace the editor content through the page's Monaco model and return what
+        the model holds afterwards. No keystrokes or OS clipboard are involved, so
+        concurrent sessions cannot interfere with each other.
+        """
+        script = """
+        const editors = monaco.editor.getEditors ? monaco.editor.getEditors() : [];
+        const model = editors.length ? editors[0].getModel() : monaco.editor.getModels()[0];
+        model.setValue(arguments[0]);
+        return model.getValue();
+        """
+        return self.driver.execute_script(script, code)
 
-        except Exception as e:
-            print(e)
-            return None
-    
+    @timed("selenium")
     def insert_code(self,code):
         """
         This function use to insert code in code editor.
         """
         try:
-            editor = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "inputarea"))
+            WebDriverWait(self.driver, 15).until(
+                lambda d: d.execute_script("return !!(window.monaco && monaco.editor.getModels().length)")
             )
-            self.driver.execute_script("arguments[0].click();", editor)
-            
-
-            # Clear existing code
-            editor.send_keys(Keys.CONTROL, "a")
-            editor.send_keys(Keys.DELETE)
-            
-            pyperclip.copy(code)  # Copy code to clipboard
-            # Paste code (maintaining indentation)
-            editor.send_keys(Keys.CONTROL, 'v')
-            editor.send_keys(Keys.RETURN)  # New line
+            editor_value = self._set_editor_value(code)
+            # Read back to make sure the editor holds exactly the generated code
+            if editor_value.replace("\r\n", "\n") != code.replace("\r\n", "\n"):
+                raise Exception("Editor content does not match generated code")
 
             return True
         except Exception as e:
             print(f"Code insertion failed: {str(e)}")
             return False
         
+    def _drain_performance_log(self):
+        """Read (and thereby clear) the CDP performance log"""
+        try:
+            return self.driver.get_log("performance")
+        except Exception:
+            return []
+
+    @timed("selenium")
+    def _wait_for_judge_id(self, path_fragment, id_key, timeout=15):
+        """
+        Watch the CDP network log for the run/submit request the page just sent
+        and read the judge id from its response body.
+
+        Returns:
+        tuple: (judge id, request body) or (None, None) if no response was seen.
+        """
+        requests_seen = {}
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for entry in self._drain_performance_log():
+                message = json.loads(entry["message"])["message"]
+                params = message.get("params", {})
+                if message["method"] == "Network.requestWillBeSent":
+                    request = params.get("request", {})
+                    if path_fragment in request.get("url", "") and request.get("method") == "POST":
+                        requests_seen[params["requestId"]] = request.get("postData")
+                elif message["method"] == "Network.loadingFinished" and params.get("requestId") in requests_seen:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    try:
+                        judge_id = json.loads(body["body"]).get(id_key)
+                    except (ValueError, AttributeError):
+                        # e.g. an HTML rate-limit page: keep watching for the page's retry
+                        print(f"Unexpected {path_fragment} response: {body.get('body', '')[:200]}")
+                        continue
+                    if judge_id:
+                        return judge_id, requests_seen[params["requestId"]]
+            time.sleep(0.1)
+        return None, None
+
+    @timed("selenium")
+    def _poll_check(self, judge_id, timeout=90):
+        """
+        Poll the judge's check endpoint for `judge_id` until it reports SUCCESS.
+
+        Returns:
+        dict: the final check response, or None on timeout.
+        """
+        script = """
+        var callback = arguments[arguments.length - 1];
+        fetch(arguments[0], {credentials: 'same-origin'})
+        .then(response => response.json())
+        .then(data => callback(data))
+        .catch(error => callback({ error: error.message }));
+        """
+        interval = 0.25
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            result = self.driver.execute_async_script(script, f"/submissions/detail/{judge_id}/check/")
+            if result.get("state") == "SUCCESS":
+                return result
+            time.sleep(interval)
+            interval = min(interval * 1.5, 1.0)
+        return None
+
+    def _mark_result_panel(self, selector):
+        """
+        Record the text of a result panel left by an earlier run, so the DOM
+        fallback waits for this run's verdict instead of reading the old one.
+        """
+        self.driver.execute_script(
+            "document.querySelectorAll(arguments[0]).forEach(e => e.setAttribute('data-stale-text', e.innerText));",
+            selector)
+
+    def _read_result_panel(self, selector, timeout):
+        """Wait for a result panel that is new or whose text changed since _mark_result_panel"""
+        def fresh_text(driver):
+            for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                text = element.text
+                if text.strip() and text.strip() not in ("Pending", "Judging") and text != element.get_attribute("data-stale-text"):
+                    return text
+            return False
+        return WebDriverWait(self.driver, timeout).until(fresh_text)
+
+    def _format_judge_result(self, result, data_input=None):
+        """Render a check response as the text LeetCode shows in its result panel"""
+        is_run = "correct_answer" in result
+        status = result.get("status_msg", "")
+        if is_run and status == "Accepted" and not result.get("correct_answer"):
+            status = "Wrong Answer"
+        lines = [status]
+        if result.get("full_compile_error") or result.get("compile_error"):
+            lines.append(result.get("full_compile_error") or result.get("compile_error"))
+        if result.get("full_runtime_error") or result.get("runtime_error"):
+            lines.append(result.get("full_runtime_error") or result.get("runtime_error"))
+        if is_run:
+            if data_input:
+                lines.append(f"Input:\n{data_input}")
+            outputs = result.get("code_answer") or []
+            expected = result.get("expected_code_answer") or []
+            for i, (output, expected_output) in enumerate(zip(outputs, expected), 1):
+                lines.append(f"Case {i}\nOutput: {output}\nExpected: {expected_output}")
+            if result.get("status_runtime"):
+                lines.append(f"Runtime: {result['status_runtime']}")
+        else:
+            if result.get("total_testcases") is not None:
+                lines.append(f"{result.get('total_correct')} / {result['total_testcases']} testcases passed")
+            if status != "Accepted" and result.get("last_testcase"):
+                lines.append(f"Last Executed Input:\n{result['last_testcase']}")
+                if result.get("code_output") is not None:
+                    lines.append(f"Output: {result['code_output']}")
+                if result.get("expected_output") is not None:
+                    lines.append(f"Expected: {result['expected_output']}")
+            if result.get("status_runtime"):
+                percentile = result.get("runtime_percentile")
+                lines.append(f"Runtime: {result['status_runtime']}" + (f" (beats {percentile:.2f}%)" if percentile is not None else ""))
+            if result.get("status_memory"):
+                percentile = result.get("memory_percentile")
+                lines.append(f"Memory: {result['status_memory']}" + (f" (beats {percentile:.2f}%)" if percentile is not None else ""))
+        return "\n".join(lines)
+
+    def _wait_for_judge(self, path_fragment, id_key):
+        """
+        Tie the click that was just made to its judge id and wait for the verdict.
+
+        Returns:
+        JudgeResult: parsed verdict, or None when the id could not be captured.
+        """
+        judge_id, request_body = self._wait_for_judge_id(path_fragment, id_key)
+        if not judge_id:
+            return None
+        result = self._poll_check(judge_id)
+        if result is None:
+            raise Exception(f"Judge did not finish {judge_id}")
+        self.last_judge_result = result
+        data_input = None
+        if request_body:
+            try:
+                data_input = json.loads(request_body).get("data_input")
+            except ValueError:
+                pass
+        return from_check(result, data_input, raw=self._format_judge_result(result, data_input))
+
+    @timed("selenium")
     def test_generated_code(self,code):
         """
         This function use to test generated code.
+
+        The parsed verdict is kept in self.last_result.
         """
+        self.last_result = None
         try:
             if self.insert_code(code):
                 test_button = WebDriverWait(self.driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, 
                         'button[data-e2e-locator="console-run-button"]'))
                 )
+                self._drain_performance_log()  # Forget network events of earlier runs
+                self._mark_result_panel(TEST_RESULT_PANEL)
                 test_button.click()
-                #check test result
-                #test_result=self.driver.find_element(By.CSS_SELECTOR, 'div[data-layout-path="/c1/ts1/t1"]')
-                test_result=WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-layout-path="/c1/ts1/t1"]'))
-                )
-                print(test_result.text)
-                return "Test Result: \n"+test_result.text
+                self.last_result = self._wait_for_judge("/interpret_solution/", "interpret_id")
+                if self.last_result is None:
+                    # Performance log unavailable: fall back to the result panel
+                    self.last_result = parse_result_text(self._read_result_panel(TEST_RESULT_PANEL, 15), source="run")
+                test_result = self.last_result.raw
+                print(test_result)
+                return "Test Result: \n"+test_result
             return "Unable to insert code in code editor."
         except Exception as e:
             print(f"Code testing failed: {str(e)}")
             return "Code testing failed."
 
+    @timed("selenium")
     def submit_generated_code(self):
         """
         This function use to submit generated code.
+
+        The parsed verdict is kept in self.last_result.
         """
+        self.last_result = None
         try:
             submit_button = WebDriverWait(self.driver, 15).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Submit')]"))
             )
+            self._drain_performance_log()  # Forget network events of earlier runs
+            self._mark_result_panel(SUBMIT_RESULT_PANEL)
             submit_button.click()
 
-            time.sleep(5)
-            submit_result=WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-layout-path="/ts0/t1"]'))
-            )
-            submit_result=submit_result.text
+            self.last_result = self._wait_for_judge("/submit/", "submission_id")
+            if self.last_result is None:
+                # Performance log unavailable: fall back to the result panel
+                self.last_result = parse_result_text(self._read_result_panel(SUBMIT_RESULT_PANEL, 30), source="submit")
+            submit_result = self.last_result.raw
             print(submit_result)
             return submit_result
         except Exception as e:
             print(f"Code submission failed: {str(e)}")
-            return "Code submission failed."
\ No newline at end of file
+            return "Code submission failed."
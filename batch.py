@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class RateLimiter:
+    """Spaces calls to wait() at least `min_interval` seconds apart across all threads"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# One limiter per process: daily runs and every batch share the submission budget
+submit_limiter = RateLimiter(float(os.getenv("SUBMIT_INTERVAL", os.getenv("BATCH_SUBMIT_INTERVAL", 30))))
+
+
+def read_progress(progress_file):
+    """Results already recorded in the checkpoint file, keyed by slug (last entry wins)"""
+    done = {}
+    if os.path.exists(progress_file):
+        with open(progress_file) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from an interrupted run
+                    done[entry["slug"]] = entry
+    return done
+
+
+def write_manifest(manifest_file, slugs, results, started_at):
+    ordered = [results[slug] for slug in slugs if slug in results]
+    manifest = {
+        "started_at": started_at,
+        "updated_at": time.time(),
+        "total": len(slugs),
+        "completed": len(ordered),
+        "accepted": sum(1 for r in ordered if r["status"] == "accepted"),
+        "failed": sum(1 for r in ordered if r["status"] != "accepted"),
+        "results": ordered,
+    }
+    tmp_file = f"{manifest_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, manifest_file)
+    return manifest
+
+
+def run_batch(slugs, graph, session_pool, workers=None, manifest_file="batch_manifest.json",
+              progress_file=None, limiter=None, retry_failed=False, config=None, on_result=None):
+    """
+    This function use to solve many problems across parallel browser sessions.
+
+    Every finished slug is appended to `progress_file` (JSON lines), so an
+    interrupted batch resumes where it stopped. Submissions from all workers,
+    and from every other batch and daily run of the process, share one rate
+    limiter. A manifest of all results is rewritten after each
+    problem.
+
+    Args:
+    slugs (list): problem slugs.
+    graph: compiled agent graph.
+    session_pool (LeetCodeSessionPool): pool the workers borrow browsers from.
+    workers (int): problems solved concurrently (default: the pool's browser cap).
+    limiter (RateLimiter): submission pacing (default: the process-wide submit_limiter).
+    retry_failed (bool): solve again slugs whose checkpointed result was not accepted.
+    config (dict): extra "configurable" entries for every run.
+    on_result (callable): called with each result dict.
+
+    Returns:
+    dict: the manifest.
+    """
+    from langchain_core.messages import HumanMessage
+    from agent import last_message, metrics_callback, get_problem_store, resume_or_start
+
+    workers = workers or session_pool.max_sessions
+    progress_file = progress_file or f"{manifest_file}.progress.jsonl"
+    limiter = limiter or submit_limiter
+    started_at = time.time()
+
+    slugs = list(dict.fromkeys(slugs))
+    results = read_progress(progress_file)
+    pending = [slug for slug in slugs if slug not in results
+               or (retry_failed and results[slug]["status"] != "accepted")]
+    print(f"Batch: {len(slugs)} problems, {len(slugs) - len(pending)} already done, {len(pending)} to solve")
+    lock = threading.Lock()
+
+    def solve(slug):
+        start = time.time()
+        status, message = "error", ""
+        try:
+            with session_pool.session() as session:
+                if session is None:
+                    raise Exception("No browser session available")
+                run_config = {"configurable": {**(config or {}), "session": session, "submit_limiter": limiter},
+                              "callbacks": [metrics_callback]}
+                graph_input, run_config = resume_or_start(
+                    graph, {"messages": [HumanMessage(f"Please solve the leetcode problem {slug}")], "slug": slug},
+                    run_config, f"{slug}:{time.strftime('%Y-%m-%d')}")
+                chunk = {}
+                for chunk in graph.stream(graph_input, run_config):
+                    pass
+                message = last_message(chunk)
+            store = run_config["configurable"].get("store") or get_problem_store()
+            status = "accepted" if store.get_solution(slug) else "failed"
+        except Exception as e:
+            message = str(e)
+            print(f"Batch problem {slug} failed: {message}")
+        result = {"slug": slug, "status": status, "seconds": round(time.time() - start, 2),
+                  "finished_at": time.time(), "message": message[-2000:]}
+        with lock:
+            results[slug] = result
+            with open(progress_file, "a") as f:
+                f.write(json.dumps(result) + "\n")
+            write_manifest(manifest_file, slugs, results, started_at)
+        print(f"Batch: {slug} -> {status} ({result['seconds']}s)")
+        if on_result:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+        list(executor.map(solve, pending))
+    return write_manifest(manifest_file, slugs, results, started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a list of LeetCode problems in parallel browser sessions")
+    parser.add_argument("slugs", nargs="*", help="problem slugs, e.g. two-sum")
+    parser.add_argument("--file", help="file with one slug per line")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", 2)), help="concurrent browser sessions")
+    parser.add_argument("--manifest", default="batch_manifest.json", help="results manifest to write")
+    parser.add_argument("--progress", help="checkpoint file (default: <manifest>.progress.jsonl)")
+    parser.add_argument("--submit-interval", type=float, help="minimum seconds between submissions (default: SUBMIT_INTERVAL or 30)")
+    parser.add_argument("--retry-failed", action="store_true", help="solve again problems that were not accepted")
+    args = parser.parse_args()
+
+    slugs = list(args.slugs)
+    if args.file:
+        with open(args.file) as f:
+            slugs += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not slugs:
+        parser.error("no slugs given")
+
+    from agent import build_graph
+    from session_pool import LeetCodeSessionPool
+
+    if args.submit_interval is not None:
+        submit_limiter.min_interval = args.submit_interval
+    session_pool = LeetCodeSessionPool(size=args.workers, max_sessions=args.workers)
+    try:
+        manifest = run_batch(slugs, build_graph(), session_pool, workers=args.workers, manifest_file=args.manifest,
+                             progress_file=args.progress,
+                             retry_failed=args.retry_failed)
+    finally:
+        session_pool.close()
+    print(f"Accepted {manifest['accepted']}/{manifest['total']} problems, manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
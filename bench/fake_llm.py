@@ -0,0 +1,142 @@
+"""
+Deterministic chat model that can replace ChatOpenAI in the agent.
+
+Prompts from generate_code/solve_error are answered with the fixture's
+scripted attempts (one more attempt per call), and the tool-calling assistant
+walks generate -> test -> submit, falling back to solve_error on failures,
+so runs are reproducible and free. Streamed answers arrive in small pieces
+with the latency spread over them, like a real streaming API.
+"""
+import re
+import json
+import time
+import itertools
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+STREAM_CHARS = 16  # Characters per streamed piece, roughly four tokens
+
+
+def _tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _text(content):
+    return content if isinstance(content, str) else str(content)
+
+
+class FakeChatModel(BaseChatModel):
+    fixtures: Dict[str, dict]
+    model_name: str = "fake-bench-model"
+    temperature: float = 0.3
+    latency: float = 0.0  # Seconds slept per call to imitate a remote model
+    attempts: Dict[str, int] = {}
+    _ids: Any = None
+    _lock: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self):
+        return "fake-bench"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.attempts.clear()
+
+    def _problem_for(self, text):
+        for slug, problem in self.fixtures.items():
+            if problem["title"] in text or f"/problems/{slug}/" in text or problem["template"].strip() in text:
+                return slug, problem
+        for slug, problem in self.fixtures.items():
+            method = re.search(r"def (\w+)\(", problem["template"])
+            if method and method.group(1) in text:
+                return slug, problem
+        raise ValueError("Prompt does not match any fixture problem")
+
+    def _next_attempt(self, text):
+        slug, problem = self._problem_for(text)
+        with self._lock:
+            index = self.attempts.get(slug, 0)
+            self.attempts[slug] = index + 1
+        code = problem["attempts"][min(index, len(problem["attempts"]) - 1)]
+        return f"Here is the solution:\n```python\n{code}```\nThis runs in linear time."
+
+    def _tool_call(self, name, args):
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{next(self._ids)}"}])
+
+    def _route(self, messages):
+        """Choose the next tool the way the system prompt asks the real model to"""
+        statement = next((_text(m.content) for m in messages if "problem_statement:" in _text(m.content)), "")
+        problem_text, _, template = statement.partition("python_code_template:")
+        problem_text = problem_text.replace("problem_statement:", "").strip()
+        last = messages[-1]
+        if not isinstance(last, ToolMessage):
+            return self._tool_call("generate_code", {"problem_statement": problem_text, "python_code": template.strip()})
+
+        previous_code = next((_text(m.content) for m in reversed(messages)
+                              if isinstance(m, ToolMessage) and m.name in ("generate_code", "solve_error")), "")
+        content = _text(last.content)
+        if last.name in ("generate_code", "solve_error"):
+            return self._tool_call("test_code", {"code": content})
+        if last.name == "test_code":
+            lines = content.split("\n")
+            if len(lines) < 2 or lines[1].strip() != "Accepted":
+                return self._tool_call("solve_error", {"problem_statement": problem_text, "error": content, "code": previous_code})
+            return self._tool_call("submit_code", {"code": previous_code})
+        if last.name == "submit_code" and not content.startswith("Accepted"):
+            return self._tool_call("solve_error", {"problem_statement": problem_text, "error": content, "code": previous_code})
+        return AIMessage(content=f"Submission result:\n\n```python\n{previous_code}\n```\n\n{content}")
+
+    def _reply(self, messages):
+        prompt = "\n".join(_text(m.content) for m in messages)
+        if len(messages) == 1 and not isinstance(messages[0], ToolMessage) and "```python [code]```" in prompt:
+            message = AIMessage(content=self._next_attempt(prompt))
+        else:
+            message = self._route(messages)
+        usage = {"prompt_tokens": _tokens(prompt), "completion_tokens": _tokens(_text(message.content)) + 10}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        message.usage_metadata = {"input_tokens": usage["prompt_tokens"], "output_tokens": usage["completion_tokens"],
+                                  "total_tokens": usage["total_tokens"]}
+        return message, usage
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        message, usage = self._reply(messages)
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={"token_usage": usage, "model_name": self.model_name})
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs):
+        message, _ = self._reply(messages)
+        if message.tool_calls:
+            tool_call_chunks = [{"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                                for i, call in enumerate(message.tool_calls)]
+            if self.latency:
+                time.sleep(self.latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks,
+                                                             usage_metadata=message.usage_metadata))
+            return
+        content = _text(message.content)
+        pieces = [content[i:i + STREAM_CHARS] for i in range(0, len(content), STREAM_CHARS)] or [""]
+        for i, piece in enumerate(pieces):
+            if self.latency:
+                time.sleep(self.latency / len(pieces))
+            last = i == len(pieces) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece,
+                                                               usage_metadata=message.usage_metadata if last else None))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
@@ -0,0 +1,249 @@
+"""
+Local stand-in for leetcode.com used by the benchmark.
+
+Serves problem pages with the DOM hooks LeetCodeSessionManager relies on
+(user avatar, #editor language button, a `window.monaco` model, the Run and
+Submit buttons and result panels), a stub GraphQL endpoint and a judge that
+runs submissions on the fixture's hidden tests through local_runner.
+"""
+import os
+import re
+import sys
+import json
+import time
+import threading
+import itertools
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_runner import run_local_tests
+from leetcode_graphql import html_to_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "problems.json")
+SESSION_COOKIE = "bench-session"
+CSRF_TOKEN = "bench-csrf"
+
+PROBLEM_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} - LeetCode</title></head>
+<body>
+<span id="navbar_user_avatar">bench</span>
+<div class="elfjS">{description}</div>
+<div id="editor">
+  <button class="rounded">Python3</button>
+  <div class="inputarea"></div>
+  <div class="view-lines"></div>
+</div>
+<button data-e2e-locator="console-run-button" onclick="judge('interpret_solution', 'interpret_id', '/c1/ts1/t1')">Run</button>
+<button onclick="judge('submit', 'submission_id', '/ts0/t1')">Submit</button>
+<div id="results"></div>
+<script>
+const SLUG = {slug};
+const DATA_INPUT = {data_input};
+window.monaco = (function() {{
+  let value = {template};
+  const model = {{ setValue(v) {{ value = v; }}, getValue() {{ return value; }} }};
+  return {{ editor: {{ getModels() {{ return [model]; }}, getEditors() {{ return [{{ getModel() {{ return model; }} }}]; }} }} }};
+}})();
+async function judge(kind, idKey, panel) {{
+  const old = document.querySelector(`div[data-layout-path="${{panel}}"]`);
+  if (old) old.remove();
+  const response = await fetch(`/problems/${{SLUG}}/${{kind}}/`, {{
+    method: 'POST',
+    headers: {{'Content-Type': 'application/json', 'x-csrftoken': '{csrf}'}},
+    body: JSON.stringify({{lang: 'python3', typed_code: monaco.editor.getModels()[0].getValue(), data_input: DATA_INPUT}})
+  }});
+  const id = (await response.json())[idKey];
+  let result = {{state: 'PENDING'}};
+  while (result.state !== 'SUCCESS') {{
+    await new Promise(r => setTimeout(r, 200));
+    result = await (await fetch(`/submissions/detail/${{id}}/check/`)).json();
+  }}
+  const div = document.createElement('div');
+  div.setAttribute('data-layout-path', panel);
+  div.innerText = result.status_msg + '\\n' + JSON.stringify(result, null, 1);
+  document.getElementById('results').appendChild(div);
+}}
+</script>
+</body></html>"""
+
+SIMPLE_PAGE = """<!DOCTYPE html>
+<html><head><title>LeetCode</title></head><body>{body}</body></html>"""
+
+
+def load_fixtures(path=FIXTURES):
+    with open(path) as f:
+        return {problem["slug"]: problem for problem in json.load(f)}
+
+
+def _examples_text(problem):
+    return html_to_text(problem["content"])
+
+
+def _field(message, label):
+    match = re.search(rf"^{label}: (.*)$", message, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+class MockLeetCode:
+    """State shared by the request handlers: fixtures, today's problem and pending judge results"""
+
+    def __init__(self, fixtures=None, judge_delay=0.5):
+        self.fixtures = fixtures or load_fixtures()
+        self.daily_slug = next(iter(self.fixtures))
+        self.judge_delay = judge_delay
+        self._ids = itertools.count(1000)
+        self._results = {}
+        self._lock = threading.Lock()
+        self.counts = {"run": 0, "submit": 0, "graphql": 0}
+
+    def judge(self, slug, code, kind):
+        """Run code on the examples (run) or hidden tests (submit) and queue the check response"""
+        problem = self.fixtures[slug]
+        tests = _examples_text(problem) if kind == "run" else problem["tests"]
+        local = run_local_tests(code, tests, problem["template"])
+        message = local["message"]
+        total = len(re.findall(r"Input:", tests))
+        result = {"state": "SUCCESS", "status_runtime": "3 ms", "status_memory": "16.5 MB"}
+        if local["status"] == "passed":
+            result.update(status_code=10, status_msg="Accepted", run_success=True)
+        elif message.startswith("Compile Error"):
+            result.update(status_code=20, status_msg="Compile Error", run_success=False,
+                          compile_error=message, full_compile_error=message)
+        elif message.startswith("Runtime Error"):
+            result.update(status_code=15, status_msg="Runtime Error", run_success=False,
+                          runtime_error=message, full_runtime_error=message, last_testcase=_field(message, "Input"))
+        elif message.startswith("Time Limit"):
+            result.update(status_code=14, status_msg="Time Limit Exceeded", run_success=False)
+        else:
+            result.update(status_code=11, status_msg="Wrong Answer", run_success=True,
+                          last_testcase=_field(message, "Input"), code_output=_field(message, "Output"),
+                          expected_output=_field(message, "Expected"))
+
+        if kind == "run":
+            correct = local["status"] == "passed"
+            if result["status_code"] in (10, 11):
+                result["status_msg"] = "Accepted"  # LeetCode reports a finished run as Accepted
+            result.update(correct_answer=correct,
+                          code_answer=[result.get("code_output") or "ok"] if not correct else ["ok"],
+                          expected_code_answer=[result.get("expected_output") or "ok"])
+        else:
+            failed_case = 1 if local["status"] != "passed" else 0
+            result.update(total_testcases=total, total_correct=total - failed_case,
+                          runtime_percentile=87.5, memory_percentile=64.2)
+
+        judge_id = str(next(self._ids))
+        with self._lock:
+            self._results[judge_id] = (time.monotonic() + self.judge_delay, result)
+            self.counts[kind] += 1
+        return judge_id
+
+    def check(self, judge_id):
+        with self._lock:
+            ready_at, result = self._results.get(judge_id, (0, None))
+        if result is None:
+            return {"state": "NOT_FOUND"}
+        if time.monotonic() < ready_at:
+            return {"state": "STARTED"}
+        return result
+
+    def graphql(self, query, variables, signed_in=True):
+        with self._lock:
+            self.counts["graphql"] += 1
+        if "userStatus" in query:
+            return {"data": {"userStatus": {"isSignedIn": signed_in, "username": "bench" if signed_in else None}}}
+        if "activeDailyCodingChallengeQuestion" in query:
+            problem = self.fixtures[self.daily_slug]
+            return {"data": {"activeDailyCodingChallengeQuestion": {
+                "link": f"/problems/{problem['slug']}/", "question": self._question(problem)}}}
+        problem = self.fixtures.get((variables or {}).get("titleSlug"))
+        return {"data": {"question": self._question(problem) if problem else None}}
+
+    def _question(self, problem):
+        return {"title": problem["title"], "titleSlug": problem["slug"], "content": problem["content"],
+                "codeSnippets": [{"langSlug": "python3", "code": problem["template"]}]}
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _signed_in(self):
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+            return "LEETCODE_SESSION" in cookie and cookie["LEETCODE_SESSION"].value == SESSION_COOKIE
+
+        def _send(self, body, content_type="text/html", status=200):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, payload, status=200):
+            self._send(json.dumps(payload), "application/json", status)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            check = re.match(r"^/submissions/detail/(\w+)/check/$", path)
+            problem = re.match(r"^/problems/([\w-]+)/(description/)?$", path)
+            if check:
+                self._json(site.check(check.group(1)))
+            elif problem and problem.group(1) in site.fixtures:
+                fixture = site.fixtures[problem.group(1)]
+                examples = re.findall(r"Input:\s*(.+)", _examples_text(fixture))
+                data_input = "\n".join(value.split("=", 1)[1].strip() for example in examples
+                                       for value in re.split(r",\s*(?=\w+\s*=)", example))
+                self._send(PROBLEM_PAGE.format(
+                    title=escape(fixture["title"]), description=fixture["content"], csrf=CSRF_TOKEN,
+                    slug=json.dumps(fixture["slug"]), template=json.dumps(fixture["template"]),
+                    data_input=json.dumps(data_input)))
+            elif path.startswith("/problemset"):
+                avatar = '<span id="navbar_user_avatar">bench</span>' if self._signed_in() else ""
+                self._send(SIMPLE_PAGE.format(body=avatar + "<h1>Problems</h1>"))
+            elif path.startswith("/accounts/login"):
+                self._send(SIMPLE_PAGE.format(body='<input id="id_login"><input id="id_password" type="password">'))
+            else:
+                self._send(SIMPLE_PAGE.format(body="<h1>LeetCode (benchmark mock)</h1>"))
+
+        def do_POST(self):
+            path = self.path.split("?")[0]
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            run = re.match(r"^/problems/([\w-]+)/(interpret_solution|submit)/$", path)
+            if path == "/graphql":
+                self._json(site.graphql(body.get("query", ""), body.get("variables"), self._signed_in()))
+            elif run and run.group(1) in site.fixtures:
+                kind = "run" if run.group(2) == "interpret_solution" else "submit"
+                judge_id = site.judge(run.group(1), body.get("typed_code", ""), kind)
+                self._json({"interpret_id" if kind == "run" else "submission_id": judge_id})
+            else:
+                self._json({"error": "not found"}, 404)
+
+    return Handler
+
+
+def start_server(site=None, host="127.0.0.1", port=0):
+    """
+    Start the mock site on a background thread.
+
+    Returns:
+    tuple: (server, site, base_url)
+    """
+    site = site or MockLeetCode()
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, site, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    server, site, base_url = start_server(port=int(os.getenv("MOCK_PORT", 8765)))
+    print(f"Mock LeetCode serving {len(site.fixtures)} problems at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,204 @@
+"""
+Offline end-to-end benchmark: runs the real agent graph and browser automation
+against the mock LeetCode site with the deterministic fake model, then reports
+per-stage and end-to-end latency percentiles, browser memory and iterations
+to acceptance.
+
+    python -m bench.run_bench --repeat 3 --json bench_results.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.mock_leetcode import MockLeetCode, start_server, load_fixtures, FIXTURES, SESSION_COOKIE, CSRF_TOKEN
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(values):
+    return {"n": len(values), "p50": percentile(values, 50), "p90": percentile(values, 90),
+            "p99": percentile(values, 99), "max": max(values) if values else 0.0}
+
+
+def browser_rss_mb(driver):
+    """Resident memory of chromedriver, Chrome and all their child processes"""
+    import psutil
+    pids = [getattr(getattr(driver, "service", None), "process", None), getattr(driver, "browser_pid", None)]
+    processes = {}
+    for pid in pids:
+        pid = getattr(pid, "pid", pid)
+        if not pid:
+            continue
+        try:
+            root = psutil.Process(pid)
+            for process in [root] + root.children(recursive=True):
+                processes[process.pid] = process
+        except psutil.Error:
+            continue
+    total = 0
+    for process in processes.values():
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def write_cookie_file(path):
+    from cookie_store import CookieStore
+    CookieStore(path).save([{"name": "LEETCODE_SESSION", "value": SESSION_COOKIE, "path": "/"},
+                            {"name": "csrftoken", "value": CSRF_TOKEN, "path": "/"}])
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="leetcode-bench-")
+    cookie_file = os.path.join(workdir, "cookies.json")
+    write_cookie_file(cookie_file)
+
+    site = MockLeetCode(load_fixtures(args.fixtures), judge_delay=args.judge_delay)
+    server, site, base_url = start_server(site)
+    os.environ["LEETCODE_BASE_URL"] = base_url
+    os.environ["LEETCODE_COOKIE_FILE"] = cookie_file
+    os.environ["BROWSER_LEAN"] = "1" if args.lean else "0"
+    os.environ["LLM_STREAM"] = "0" if args.no_stream else "1"
+
+    # Imported after the environment points at the mock site
+    from langchain_core.messages import HumanMessage
+    from LeetCode import LeetCodeSessionManager
+    from leetcode_graphql import LeetCodeGraphQLClient
+    from problem_store import ProblemStore
+    from agent import build_graph, metrics_callback
+    from metrics import start_trace, finish_trace
+    from bench.fake_llm import FakeChatModel
+
+    slugs = args.problems or list(site.fixtures)
+    graph = build_graph(args.mode, checkpoint=False)  # Every run starts fresh
+    llm = FakeChatModel(fixtures=site.fixtures, latency=args.llm_latency)
+    graphql = LeetCodeGraphQLClient(base_url=base_url, cookie_file=cookie_file)
+
+    stages = defaultdict(list)
+    end_to_end = []
+    runs = []
+
+    session = LeetCodeSessionManager()
+    start = time.perf_counter()
+    if not session.start_session():
+        raise SystemExit("Could not start a browser session against the mock site")
+    stages["session:start_session"].append(time.perf_counter() - start)
+    memory = {"after_start_mb": browser_rss_mb(session.driver)}
+
+    try:
+        for repeat in range(args.repeat):
+            for slug in slugs:
+                site.daily_slug = slug
+                llm.reset()
+                store = ProblemStore(os.path.join(workdir, f"store-{repeat}-{slug}.db"))
+                config = {"configurable": {"session": session, "llm": llm, "graphql": graphql, "store": store,
+                                           "bypass_llm_cache": True, "candidates": args.candidates},
+                          "callbacks": [metrics_callback], "recursion_limit": args.recursion_limit}
+                trace, token = start_trace(f"bench-{repeat}-{slug}", slug=slug)
+                start = time.perf_counter()
+                error = None
+                try:
+                    for _ in graph.stream({"messages": [HumanMessage("Please solve todays leetcode problem")]}, config):
+                        pass
+                except Exception as e:
+                    error = str(e)
+                duration = time.perf_counter() - start
+                finish_trace(trace, token, trace_dir=args.trace_dir)
+
+                end_to_end.append(duration)
+                spans = trace.to_dict()["spans"]
+                for span in spans:
+                    stages[f"{span['kind']}:{span['name']}"].append(span["duration"])
+                accepted = store.get_solution(slug) is not None
+                runs.append({
+                    "slug": slug, "repeat": repeat, "seconds": round(duration, 3), "accepted": accepted,
+                    # Tools in react mode, graph nodes of the same name in pipeline mode
+                    "iterations": sum(1 for s in spans if s["kind"] in ("tool", "node") and s["name"] in ("generate_code", "solve_error")),
+                    "remote_runs": sum(1 for s in spans if s["kind"] == "selenium" and s["name"] == "test_generated_code"),
+                    "llm_calls": sum(1 for s in spans if s["kind"] == "llm"),
+                    "error": error,
+                })
+                print(f"{slug:<24} run {repeat + 1}: {duration:7.2f}s accepted={accepted} "
+                      f"iterations={runs[-1]['iterations']} remote_runs={runs[-1]['remote_runs']}")
+        memory["after_runs_mb"] = browser_rss_mb(session.driver)
+    finally:
+        session.close()
+        server.shutdown()
+
+    accepted_runs = [r for r in runs if r["accepted"]]
+    report = {
+        "mode": args.mode,
+        "lean_browser": args.lean,
+        "streaming": not args.no_stream,
+        "problems": slugs,
+        "repeat": args.repeat,
+        "end_to_end_seconds": summarize(end_to_end),
+        "stages_seconds": {name: summarize(values) for name, values in sorted(stages.items())},
+        "browser_memory_mb": memory,
+        "accepted": len(accepted_runs),
+        "runs": len(runs),
+        "iterations_to_acceptance": summarize([r["iterations"] for r in accepted_runs]),
+        "remote_runs_per_problem": summarize([r["remote_runs"] for r in runs]),
+        "llm_calls_per_problem": summarize([r["llm_calls"] for r in runs]),
+        "judge_requests": dict(site.counts),
+        "details": runs,
+    }
+    return report
+
+
+def print_report(report):
+    browser = "lean" if report["lean_browser"] else "full"
+    streaming = "streamed" if report["streaming"] else "blocking"
+    print(f"\nAccepted {report['accepted']}/{report['runs']} runs ({report['mode']} mode, {browser} browser, {streaming} completions)")
+    print("Browser memory: " + ", ".join(f"{k}={v:.0f}MB" for k, v in report["browser_memory_mb"].items()))
+    print(f"Judge requests: {report['judge_requests']}")
+    print(f"\n{'stage':<44}{'n':>5}{'p50':>10}{'p90':>10}{'p99':>10}")
+    rows = [("end_to_end", report["end_to_end_seconds"])] + list(report["stages_seconds"].items())
+    for name, stats in rows:
+        print(f"{name:<44}{stats['n']:>5}{stats['p50']:>10.3f}{stats['p90']:>10.3f}{stats['p99']:>10.3f}")
+    iterations = report["iterations_to_acceptance"]
+    print(f"\nIterations to acceptance: p50={iterations['p50']} p90={iterations['p90']} max={iterations['max']}")
+    llm_calls = report["llm_calls_per_problem"]
+    print(f"LLM calls per problem: p50={llm_calls['p50']} p90={llm_calls['p90']} max={llm_calls['max']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the LeetCode solver pipeline")
+    parser.add_argument("--fixtures", default=FIXTURES, help="problem corpus (JSON)")
+    parser.add_argument("--problems", nargs="*", help="slugs to run (default: every fixture)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per problem")
+    parser.add_argument("--judge-delay", type=float, default=0.5, help="seconds the mock judge stays pending")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the fake model sleeps per call")
+    parser.add_argument("--mode", choices=["react", "pipeline"], default="react", help="agent graph to benchmark")
+    parser.add_argument("--lean", action="store_true", help="headless browser with resource blocking (BROWSER_LEAN=1)")
+    parser.add_argument("--no-stream", action="store_true", help="wait for whole completions (LLM_STREAM=0)")
+    parser.add_argument("--candidates", type=int, default=1, help="parallel generation candidates")
+    parser.add_argument("--recursion-limit", type=int, default=50)
+    parser.add_argument("--trace-dir", default="", help="also write per-run JSON traces here")
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
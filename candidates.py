@@ -0,0 +1,88 @@
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from local_runner import run_local_tests, code_block_end, extract_code
+
+
+# Appended to the prompt of each candidate so parallel completions explore different solutions
+VARIANT_HINTS = [
+    "",
+    "Prefer the most straightforward correct approach.",
+    "Aim for the optimal time complexity allowed by the constraints.",
+    "Consider edge cases (empty input, duplicates, extreme values) before writing the code.",
+    "Consider a different algorithmic technique than the most obvious one.",
+]
+
+
+def candidate_temperature(index, k, low=0.2, high=1.0):
+    """Spread candidate temperatures evenly between `low` and `high`"""
+    return low if k <= 1 else round(low + (high - low) * index / (k - 1), 2)
+
+
+def _with_temperature(llm, temperature):
+    """Copy of a pydantic chat model with another temperature; other models are used unchanged"""
+    if hasattr(llm, "model_copy") and hasattr(llm, "temperature"):
+        return llm.model_copy(update={"temperature": temperature})
+    return llm
+
+
+def generate_candidates(cache, llm, prompt, k, description, template, bypass=False, stream=False):
+    """
+    This function use to request `k` diverse solutions concurrently and return the
+    first one that passes the problem's examples locally. The streams of the
+    remaining candidates are closed as soon as there is a winner, and
+    candidates that fail the examples are dropped from the cache so a retry
+    does not get them back.
+
+    Args:
+    cache (LLMCache): completion cache used for every candidate.
+    llm: chat model.
+    prompt (str): code generation prompt.
+    k (int): number of candidates.
+    description (str): problem statement, used for the local check.
+    template (str): python code template, used for the local check.
+    stream (bool): stream each completion and stop reading once its code block closes.
+
+    Returns:
+    str: winning completion, or the first completion when none passes.
+    """
+    stop = threading.Event()
+
+    def generate(index):
+        hint = VARIANT_HINTS[index % len(VARIANT_HINTS)]
+        candidate_prompt = f"{prompt}\n    {hint}" if hint else prompt
+        content = cache.invoke(_with_temperature(llm, candidate_temperature(index, k)), candidate_prompt,
+                               bypass=bypass, stream=stream, until=code_block_end, stop=stop)
+        if content is None or stop.is_set():
+            return index, content, None
+        return index, content, run_local_tests(content, description, template)
+
+    executor = ThreadPoolExecutor(max_workers=k, thread_name_prefix="candidate")
+    # Copy the context so callbacks and the active trace follow each candidate into its thread
+    futures = [executor.submit(contextvars.copy_context().run, generate, i) for i in range(k)]
+    first = None
+    try:
+        for future in as_completed(futures):
+            try:
+                index, content, local_result = future.result()
+            except Exception as e:
+                print(f"Candidate generation failed: {str(e)}")
+                continue
+            if local_result is None:
+                continue
+            print(f"Candidate {index + 1}/{k}: {local_result['status']}")
+            if local_result["status"] == "passed":
+                return content
+            if local_result["status"] == "skipped":
+                # Examples cannot be checked locally, so the fastest candidate wins
+                return content
+            cache.discard_code(extract_code(content))
+            if first is None:
+                first = content
+    finally:
+        stop.set()  # Closes the streams of the candidates still generating
+        executor.shutdown(wait=False, cancel_futures=True)
+    if first is None:
+        raise RuntimeError("All candidate generations failed")
+    return first
@@ -0,0 +1,486 @@
+import os
+import re
+import sys
+import json
+import math
+import random
+import string
+import tempfile
+import subprocess
+from dotenv import load_dotenv
+from local_runner import PRELUDE, METHOD_RE, UNSUPPORTED_TYPES, extract_code, _split_top_level
+
+load_dotenv()
+
+
+# Runs inside the child interpreter: times the method on each input, smallest
+# first, printing one JSON line per event so a killed run still leaves evidence.
+PROFILE_HARNESS = PRELUDE + r'''
+import time, signal
+_payload = json.loads(sys.stdin.read())
+_apply_limits(_payload["memory_mb"], _payload["cpu_seconds"])
+_out = sys.stdout
+sys.stdout = io.StringIO()
+
+def _emit(**event):
+    _out.write(json.dumps(event) + "\n")
+    _out.flush()
+
+class _OverLimit(BaseException):
+    pass
+
+def _stop(signum, frame):
+    raise _OverLimit()
+
+if hasattr(signal, "SIGALRM"):
+    signal.signal(signal.SIGALRM, _stop)
+
+try:
+    exec(compile(_payload["code"], "solution.py", "exec"), globals())
+    _method = getattr(Solution(), _payload["method"])
+except BaseException:
+    _emit(event="error", message=traceback.format_exc(limit=-1))
+    sys.exit(0)
+
+_limit = _payload["limit"]
+_points = []
+for _case in _payload["inputs"]:
+    _size = _case["size"]
+    if len(_points) >= 2 and _points[-1][1] >= 1e-3:
+        (_n0, _t0), (_n1, _t1) = _points[-2], _points[-1]
+        _slope = log(_t1 / max(_t0, 1e-6)) / log(_n1 / _n0) if _n1 > _n0 else 0
+        _predicted = _t1 * (_size / _n1) ** max(_slope, 1)
+        if _predicted > _limit:
+            _emit(event="predicted", size=_size, seconds=_predicted)
+            break
+    _emit(event="start", size=_size)
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, _limit)
+    _started = time.perf_counter()
+    try:
+        _method(*_case["args"])
+    except _OverLimit:
+        _emit(event="over_limit", size=_size, seconds=time.perf_counter() - _started)
+        break
+    except BaseException:
+        _emit(event="error", size=_size, message=traceback.format_exc(limit=-1))
+        break
+    _elapsed = time.perf_counter() - _started
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    _emit(event="done", size=_size, seconds=_elapsed)
+    _points.append((_size, _elapsed))
+    if _elapsed > _limit:
+        break
+'''
+
+FRACTIONS = (0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0)  # Input sizes, as fractions of the largest allowed
+MAX_ELEMENTS = 2_000_000  # Nested inputs are shrunk to this many values at most
+NOISE_SECONDS = 1e-3      # Shorter runs are too noisy to fit a growth rate on
+PROFILE_MARGIN = 3        # Only estimates this many times over the time limit count as a clear TLE
+
+BOUND_RE = re.compile(r"^\s*(?P<lo>[-+\d\s*^()]+?)\s*<=?\s*(?P<names>[A-Za-z_][\w\[\]\.,\s]*?)\s*<=?\s*(?P<hi>[-+\w\s*^().]+?)\s*\.?\s*$")
+ALIAS_RE = re.compile(r"^\s*(\w+)\s*==\s*(\w+)(\[i\])?\.length\s*\.?\s*$")
+FIXED_RE = re.compile(r"^\s*(\w+)\[i\]\.length\s*==\s*(\d+)\s*\.?\s*$")
+PARAM_RE = re.compile(r"^\s*(\w+)\s*:\s*(.+?)\s*$")
+# Forms bounds are written in: `a`, `a^b`, `c * a^b` and `a^b ± c`, optionally negated
+NUMBER_RE = re.compile(r"\s*([-+])?\s*(?:(\d{1,6})\s*\*\s*)?(\d{1,6})(?:\s*\^\s*(\d{1,3}))?(?:\s*([-+])\s*(\d{1,6}))?\s*")
+MAX_POWER = 64  # Larger exponents are not real bounds and would only cost time to compute
+
+
+def _number(text):
+    """Value of a bound such as `10^4`, `5 * 10^4`, `-2^31` or `2^31 - 1`, or None"""
+    match = NUMBER_RE.fullmatch(text.replace("(", "").replace(")", ""))
+    if not match:
+        return None
+    sign, factor, base, power, op, offset = match.groups()
+    if power and int(power) > MAX_POWER:
+        return None
+    value = int(factor or 1) * int(base) ** int(power or 1)
+    if op:
+        value += int(offset) if op == "+" else -int(offset)
+    return -value if sign == "-" else value
+
+
+def _name_key(name):
+    """`nums.length` -> ("nums", "len"), `grid[i].length` -> ("grid", "inner_len"), `nums[i]` -> ("nums", "value")"""
+    name = name.strip()
+    match = re.fullmatch(r"(\w+)(\[\w\])?(\[\w\])?(\.length)?", name)
+    if not match:
+        return None
+    base, first, second, length = match.groups()
+    if length:
+        return base, "inner_len" if first else "len"
+    return base, "value"
+
+
+def parse_constraints(description):
+    """
+    This function use to read the bounds from the Constraints section of a problem description.
+
+    Returns:
+    dict: {(name, kind): (low, high)} where kind is "len", "inner_len" or "value"
+    and high may also be a reference such as ("nums", "len"), plus an
+    "_charset" entry with the characters strings are built from.
+    """
+    text = description or ""
+    section = text.split("Constraints:", 1)[1] if "Constraints:" in text else text
+    section = re.split(r"\n\s*(?:Follow[- ]up|Note)\b", section, maxsplit=1)[0]
+    lines = [line for line in section.splitlines() if line.strip()]
+
+    aliases = {}
+    bounds = {}
+    for line in lines:
+        alias = ALIAS_RE.match(line)
+        if alias:
+            aliases[alias.group(1)] = (alias.group(2), "inner_len" if alias.group(3) else "len")
+            continue
+        fixed = FIXED_RE.match(line)
+        if fixed:
+            bounds[(fixed.group(1), "inner_len")] = (int(fixed.group(2)), int(fixed.group(2)))
+            continue
+        match = BOUND_RE.match(line)
+        if not match:
+            continue
+        low = _number(match.group("lo"))
+        high = _number(match.group("hi"))
+        if high is None:
+            high = _name_key(match.group("hi"))  # e.g. `1 <= k <= nums.length`
+        if low is None or high is None:
+            continue
+        for name in match.group("names").split(","):
+            key = _name_key(name)
+            if key:
+                bounds[key] = (low, high)
+
+    # `n == nums.length` with `1 <= n <= 10^5` bounds the length of nums
+    for alias, target in aliases.items():
+        if (alias, "value") in bounds and target not in bounds:
+            bounds[target] = bounds[(alias, "value")]
+
+    bounds["_charset"] = _charset(section)
+    return bounds
+
+
+def _charset(text):
+    lowered = text.lower()
+    quoted = re.search(r"consists of[^\n]*?'([^'\s]{2,})'", text)
+    if quoted:
+        return quoted.group(1)
+    either = re.search(r"'(.)' or '(.)'", text)  # e.g. grid[i][j] is '0' or '1'
+    if either:
+        return either.group(1) + either.group(2)
+    if "binary string" in lowered or re.search(r"only (?:of )?'0'", lowered):
+        return "01"
+    chars = ""
+    if "lowercase" in lowered:
+        chars += string.ascii_lowercase
+    if "uppercase" in lowered:
+        chars += string.ascii_uppercase
+    if "english letters" in lowered and not chars:
+        chars += string.ascii_letters
+    if "digit" in lowered:
+        chars += string.digits
+    if "symbols" in lowered or "spaces" in lowered:
+        chars += " !#$%&*+-./:;=?@_"
+    return chars or string.ascii_lowercase
+
+
+def parse_signature(template):
+    """
+    This function use to find the Solution method and its annotated parameters in the code template.
+
+    Returns:
+    tuple: (method name, [(parameter name, type annotation)]) or None when the
+    template is not a plain Solution class or a parameter has no annotation.
+    """
+    match = METHOD_RE.search(template or "")
+    if not match or any(t in template for t in UNSUPPORTED_TYPES):
+        return None
+    params = []
+    for part in _split_top_level(match.group(2)):
+        if not part.strip():
+            continue
+        param = PARAM_RE.match(part)
+        if not param:
+            return None
+        params.append((param.group(1), param.group(2).replace("typing.", "").replace(" ", "")))
+    return match.group(1), params
+
+
+def _inner_type(annotation):
+    match = re.fullmatch(r"List\[(.+)\]", annotation)
+    return match.group(1) if match else None
+
+
+def _supported(annotation):
+    if annotation in ("int", "float", "bool", "str"):
+        return True
+    inner = _inner_type(annotation)
+    return bool(inner) and _supported(inner)
+
+
+def _resolve(high, lengths):
+    """Upper bound that may refer to the generated length of another parameter"""
+    if isinstance(high, tuple):
+        return lengths.get(high[0])
+    return high
+
+
+class _Generator:
+    """Random inputs for one method signature, scaled to a fraction of the constraint bounds"""
+
+    def __init__(self, params, bounds, seed=0):
+        self.params = params
+        self.bounds = bounds
+        self.random = random.Random(seed)
+        self.sized = [name for name, annotation in params if annotation == "str" or _inner_type(annotation)]
+
+    def max_lengths(self):
+        """Largest length of every list/str parameter, or None when one has no bound"""
+        lengths = {}
+        for name in self.sized:
+            bound = self.bounds.get((name, "len"))
+            if not bound or isinstance(bound[1], tuple):
+                return None
+            lengths[name] = max(bound[1], 1)
+        return lengths
+
+    def scalar_range(self, name, lengths):
+        low, high = self.bounds.get((name, "value"), (0, 100))
+        high = _resolve(high, lengths)
+        if high is None:
+            high = 100
+        return low, max(low, high)
+
+    def value(self, annotation, name, low, high):
+        if annotation == "int":
+            return self.random.randint(low, high)
+        if annotation == "float":
+            return self.random.uniform(low, high)
+        if annotation == "bool":
+            return self.random.random() < 0.5
+        if annotation == "str":
+            # Words of a List[str]: short, within `words[i].length` when given
+            high = self.bounds.get((name, "inner_len"), (1, 10))[1]
+            length = max(1, min(high if isinstance(high, int) else 10, 10))
+            return "".join(self.random.choices(self.bounds["_charset"], k=length))
+        return None
+
+    def build(self, name, annotation, length, fraction):
+        """A list/str value of `length` elements"""
+        if annotation == "str":
+            return "".join(self.random.choices(self.bounds["_charset"], k=length))
+        inner = _inner_type(annotation)
+        low, high = self.bounds.get((name, "value"), (-10**4, 10**4))
+        high = max(low, 10**4 if isinstance(high, tuple) else high)
+        if inner in ("int", "float", "bool", "str"):
+            return [self.value(inner, name, low, high) for _ in range(length)]
+        # Nested lists: a grid or a list of pairs/intervals
+        inner_bound = self.bounds.get((name, "inner_len"))
+        if inner_bound and isinstance(inner_bound[1], int):
+            inner_length = inner_bound[1] if inner_bound[0] == inner_bound[1] else max(1, round(inner_bound[1] * fraction))
+        else:
+            inner_length = 2
+        inner_length = max(1, min(inner_length, MAX_ELEMENTS // max(length, 1)))
+        element = _inner_type(inner) or "int"
+        if element == "str":  # A grid of characters
+            return [self.random.choices(self.bounds["_charset"], k=inner_length) for _ in range(length)]
+        rows = [[self.value(element, name, low, high) for _ in range(inner_length)] for _ in range(length)]
+        if element == "int" and inner_length == 2:
+            rows = [sorted(row) for row in rows]  # Pairs are usually [start, end]
+        return rows
+
+    def inputs(self, fraction, max_lengths):
+        """Arguments for one run and the size reported for it"""
+        lengths = {name: max(1, round(max_lengths[name] * fraction)) for name in self.sized}
+        args = []
+        for name, annotation in self.params:
+            if name in lengths:
+                args.append(self.build(name, annotation, lengths[name], fraction))
+                continue
+            low, high = self.scalar_range(name, lengths)
+            if not self.sized and annotation == "int":
+                args.append(max(low, round(high * fraction)))  # Scalar-only problems scale with the number itself
+                continue
+            args.append(self.value(annotation, name, low, high))
+        if lengths:
+            return max(lengths.values()), args
+        return max((abs(arg) for arg in args if isinstance(arg, (int, float))), default=1), args
+
+
+def generate_inputs(template, description, seed=0):
+    """
+    This function use to generate inputs of increasing size that fit the method signature and the constraints.
+
+    Returns:
+    tuple: (method name, [{"size", "args"}], largest size) or a str with the
+    reason no inputs could be generated.
+    """
+    signature = parse_signature(template)
+    if not signature:
+        return "Template is not supported by the profiler."
+    method, params = signature
+    if not params:
+        return "Method takes no input."
+    unsupported = [annotation for _, annotation in params if not _supported(annotation)]
+    if unsupported:
+        return f"Parameter type {unsupported[0]} is not supported by the profiler."
+
+    bounds = parse_constraints(description)
+    generator = _Generator(params, bounds, seed)
+    max_lengths = generator.max_lengths()
+    if max_lengths is None:
+        return "No length bound found in the constraints."
+    if not generator.sized:
+        int_bounds = [bounds.get((name, "value")) for name, annotation in params if annotation == "int"]
+        if not any(bound and isinstance(bound[1], int) for bound in int_bounds):
+            return "No bound found in the constraints."
+
+    inputs, sizes = [], set()
+    largest = None
+    for fraction in FRACTIONS:
+        size, args = generator.inputs(fraction, max_lengths)
+        largest = size
+        if size not in sizes and size > 0:
+            sizes.add(size)
+            inputs.append({"size": size, "args": args})
+    if len(inputs) < 2:
+        return "Constraints are too small to profile."
+    return method, inputs, largest
+
+
+def growth_exponent(points):
+    """
+    This function use to estimate the exponent k of a running time that grows like n^k.
+
+    Fits a least-squares line through log(time) against log(size) of the runs
+    long enough to measure, so O(n) gives about 1 and O(n^2) about 2.
+
+    Returns:
+    float or None when fewer than two runs were measurable.
+    """
+    points = [(n, t) for n, t in points if t >= NOISE_SECONDS and n > 0]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    points = points[-3:]
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var if var else None
+
+
+def describe_growth(exponent):
+    if exponent is None:
+        return "too fast to measure"
+    if exponent < 0.5:
+        return "about O(1) or O(log n)"
+    if exponent > 4.5:
+        return "exponential or worse"
+    return f"about O(n^{exponent:.1f})"
+
+
+def _read_events(stdout):
+    events = []
+    for line in (stdout or "").splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+def profile_solution(code, description, template, time_limit=None, memory_mb=None, seed=0):
+    """
+    This function use to time the code locally on generated inputs up to the
+    constraint bounds and predict whether it would exceed the time limit.
+
+    Inputs are random values that fit the constraints, run smallest first in a
+    separate Python process. Only a fitted growth rate that extrapolates to
+    more than PROFILE_MARGIN times the limit at the largest size makes the
+    verdict "slow". Random inputs may hit worst cases or break preconditions
+    the real tests never do, so a run that stops early without such growth
+    evidence is "skipped".
+
+    Args:
+    code (str): generated code, optionally wrapped in a ```python block.
+    description (str): problem statement text, including its constraints.
+    template (str): python code template.
+    time_limit (float): seconds allowed for one run at the largest size.
+
+    Returns:
+    dict: {"status": "ok" | "slow" | "skipped", "message": str, "timings": [[size, seconds]], "exponent": float or None}
+    """
+    time_limit = time_limit or float(os.getenv("PROFILE_TIME_LIMIT", 2))
+    memory_mb = memory_mb or int(os.getenv("LOCAL_TEST_MEMORY_MB", 512))
+
+    generated = generate_inputs(template, description, seed)
+    if isinstance(generated, str):
+        return {"status": "skipped", "message": generated, "timings": [], "exponent": None}
+    method, inputs, largest = generated
+
+    budget = time_limit * PROFILE_MARGIN
+    timeout = budget * 2 + 5
+    payload = json.dumps({"code": extract_code(code), "method": method, "inputs": inputs, "limit": budget,
+                          "memory_mb": memory_mb, "cpu_seconds": int(timeout) + 1})
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-I", "-c", PROFILE_HARNESS],
+            input=payload, capture_output=True, text=True,
+            timeout=timeout, cwd=tempfile.gettempdir(),
+        )
+        stdout, returncode = completed.stdout, completed.returncode
+    except subprocess.TimeoutExpired as e:
+        stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else e.stdout
+        returncode = None
+
+    events = _read_events(stdout)
+    timings = [[event["size"], event["seconds"]] for event in events if event["event"] == "done"]
+    exponent = growth_exponent(timings)
+    result = {"status": "ok", "message": "", "timings": timings, "exponent": exponent}
+    error = next((event for event in events if event["event"] == "error"), None)
+    if error:
+        # Random inputs may break preconditions the examples satisfy, so this proves nothing
+        reason = "Generated input raised an error" if "size" in error else "Code could not be loaded"
+        result.update(status="skipped", message=f"{reason}:\n{error['message']}")
+        return result
+
+    started = [event["size"] for event in events if event["event"] == "start"]
+    # A run that was started but never reported was killed by the timeout or CPU limit
+    unfinished = started[-1] if started and (not timings or timings[-1][0] != started[-1]) else None
+    if unfinished is None and not timings:
+        result.update(status="skipped", message=f"Profiling run crashed (exit code {returncode}).")
+        return result
+
+    evidence = [f"n={size}: {seconds:.3f}s" for size, seconds in timings[-4:]]
+    stopped = next((event for event in events if event["event"] in ("over_limit", "predicted")), None)
+    if stopped and stopped["event"] == "over_limit":
+        evidence.append(f"n={stopped['size']}: stopped after {stopped['seconds']:.1f}s")
+    elif unfinished is not None:
+        evidence.append(f"n={unfinished}: did not finish within {timeout:.0f}s")
+
+    estimate = None
+    if exponent is not None:
+        size, seconds = timings[-1]
+        estimate = seconds * (largest / size) ** max(exponent, 1) if size < largest else seconds
+    if estimate is not None and estimate > budget:
+        lines = [f"Time Limit Exceeded (predicted locally, limit {time_limit:g}s per input, largest n={largest}).",
+                 f"Measured on random inputs that fit the constraints: {', '.join(evidence)}.",
+                 f"Running time grows {describe_growth(exponent)}.",
+                 f"Estimated {estimate:.1f}s at n={largest}, more than {PROFILE_MARGIN}x the limit.",
+                 "Use an algorithm with lower time complexity."]
+        result.update(status="slow", message="\n".join(lines))
+        return result
+
+    if stopped or unfinished is not None or timings[-1][1] > budget:
+        result.update(status="skipped", message=(
+            f"Profiling stopped early but the measured growth does not predict a Time Limit Exceeded: "
+            f"{', '.join(evidence)}. The generated input may not fit every precondition."))
+        return result
+
+    size, seconds = timings[-1]
+    result["message"] = (f"Largest input (n={size}) ran in {seconds:.3f}s locally, growth {describe_growth(exponent)}"
+                         + (f", estimated {estimate:.2f}s at n={largest}" if estimate is not None and size < largest else "")
+                         + f", not clearly over the {time_limit:g}s limit.")
+    return result
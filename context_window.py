@@ -0,0 +1,135 @@
+import os
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+context_token_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", 6000))
+
+CODE_TOOLS=("generate_code", "solve_error")
+SUMMARY_CHARS=300  # Head of an older test/submit result kept in its summary
+ARG_CHARS=120      # Longer tool-call arguments of older steps are replaced by a placeholder
+
+
+def _text(content):
+    return content if isinstance(content, str) else str(content)
+
+
+def estimate_tokens(messages):
+    """Rough prompt size (about four characters per token), good enough for budgeting"""
+    total=0
+    for message in messages:
+        total+=4+len(_text(message.content))//4
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            total+=len(str(tool_call.get("args", "")))//4
+    return total
+
+
+def _is_statement(message):
+    return isinstance(message, HumanMessage) and _text(message.content).startswith("problem_statement:")
+
+
+def _compact_args(message):
+    """Copy of an AIMessage whose long tool-call arguments are replaced by short placeholders"""
+    if not isinstance(message, AIMessage) or not message.tool_calls:
+        return message
+    tool_calls=[]
+    for tool_call in message.tool_calls:
+        args={key: (f"[{len(value)} chars omitted]" if isinstance(value, str) and len(value)>ARG_CHARS else value)
+              for key, value in tool_call["args"].items()}
+        tool_calls.append({**tool_call, "args": args})
+    additional_kwargs={key: value for key, value in message.additional_kwargs.items() if key!="tool_calls"}
+    return message.model_copy(update={"tool_calls": tool_calls, "additional_kwargs": additional_kwargs})
+
+
+def _summarize_tool_output(message, attempt):
+    """Copy of an older ToolMessage reduced to a one-paragraph summary"""
+    content=_text(message.content)
+    if message.name in CODE_TOOLS:
+        summary=f"[Attempt {attempt} ({message.name}): {len(content.splitlines())} lines, superseded by a later attempt]"
+    elif len(content)>SUMMARY_CHARS:
+        summary=f"[Earlier {message.name} result, truncated]\n{content[:SUMMARY_CHARS].rstrip()} ..."
+    else:
+        return message
+    return message.model_copy(update={"content": summary})
+
+
+def _truncate(message, max_chars):
+    content=_text(message.content)
+    if len(content)<=max_chars:
+        return message
+    half=max_chars//2
+    return message.model_copy(update={"content": f"{content[:half]}\n... [{len(content)-max_chars} chars omitted] ...\n{content[-half:]}"})
+
+
+def _groups(messages):
+    """Split into steps: an AIMessage together with the ToolMessages answering it"""
+    groups=[]
+    for message in messages:
+        if isinstance(message, ToolMessage) and groups:
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+def compact_messages(messages, budget=None):
+    """
+    This function use to bound the conversation sent to the assistant model.
+
+    The user request, the problem statement and everything from the step that
+    produced the latest code onwards are kept verbatim. Older generated code is
+    collapsed to a one-line note, older test/submit output to its first lines
+    and older tool-call arguments to placeholders. If the result is still over
+    `budget` tokens the oldest steps are dropped, then long recent tool outputs
+    other than the latest code are shortened.
+
+    Args:
+    messages (list): conversation from the graph state.
+    budget (int): token budget; 0 disables compaction.
+
+    Returns:
+    list: messages to send (the state itself is not modified).
+    """
+    budget=context_token_budget if budget is None else budget
+    if not budget:
+        return messages
+
+    statement=next((i for i, m in enumerate(messages) if _is_statement(m)), 0)
+    head=list(messages[:statement+1])
+    rest=list(messages[statement+1:])
+    latest_code=max((i for i, m in enumerate(rest) if isinstance(m, ToolMessage) and m.name in CODE_TOOLS), default=None)
+    if latest_code is None:
+        return messages
+    # Start of the step (AIMessage + tool outputs) that produced the latest code
+    boundary=max((i for i in range(latest_code) if isinstance(rest[i], AIMessage)), default=0)
+
+    older=[]
+    attempt=0
+    for message in rest[:boundary]:
+        if isinstance(message, ToolMessage):
+            if message.name in CODE_TOOLS:
+                attempt+=1
+            message=_summarize_tool_output(message, attempt)
+        older.append(_compact_args(message))
+    recent=[_compact_args(rest[boundary])]+rest[boundary+1:]
+
+    older_groups=_groups(older)
+    dropped=0
+    while older_groups and estimate_tokens(head+[m for g in older_groups for m in g]+recent)>budget:
+        dropped+=len(older_groups.pop(0))
+    older=[m for g in older_groups for m in g]
+    if dropped:
+        older.insert(0, HumanMessage(f"[{dropped} earlier messages omitted to fit the context budget]"))
+
+    compacted=head+older+recent
+    overflow=estimate_tokens(compacted)-budget
+    if overflow>0:
+        # Last resort: shorten long tool outputs of the recent steps, never the latest code
+        latest=rest[latest_code]
+        for i, message in enumerate(recent):
+            if isinstance(message, ToolMessage) and message is not latest:
+                recent[i]=_truncate(message, max(SUMMARY_CHARS*2, len(_text(message.content))-overflow*4))
+        compacted=head+older+recent
+    return compacted
@@ -0,0 +1,97 @@
+import os
+import json
+import pickle
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialised
+    fcntl = None
+
+load_dotenv()
+
+
+class CookieStore:
+    """
+    Browser cookies saved as JSON and shared by every browser session and the
+    GraphQL client. Writes go to a temporary file that replaces the store
+    atomically, so readers never see a partial file; writers are serialised
+    by a lock (and an flock on POSIX, across processes). A cookie file
+    pickled by older versions is converted on first use.
+    """
+
+    def __init__(self, path=None):
+        path = path or os.getenv("LEETCODE_COOKIE_FILE", "leetcode_cookies.json")
+        if path.endswith(".pkl"):
+            path = path[:-len(".pkl")] + ".json"
+        self.path = path
+        self.legacy_path = path[:-len(".json")] + ".pkl" if path.endswith(".json") else None
+        self._lock = threading.Lock()
+        self._cache = (None, [])  # (mtime, cookies)
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _migrate(self):
+        """Convert the pickled cookie file of older versions, once"""
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "rb") as f:
+                cookies = pickle.load(f)
+            self.save(cookies)
+            print(f"Converted {self.legacy_path} to {self.path}")
+        except Exception as e:
+            print(f"Could not convert {self.legacy_path}: {str(e)}")
+
+    def mtime(self):
+        self._migrate()
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def load(self):
+        """
+        This function use to read the saved cookies, re-reading the file only when it changed.
+
+        Returns:
+        list: cookie dicts as returned by Selenium's get_cookies(), empty when none are saved.
+        """
+        mtime = self.mtime()
+        if mtime is None:
+            return []
+        with self._lock:
+            if self._cache[0] != mtime:
+                try:
+                    with open(self.path) as f:
+                        self._cache = (mtime, json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"Could not read cookies: {str(e)}")
+                    return []
+            return [dict(cookie) for cookie in self._cache[1]]
+
+    def save(self, cookies):
+        """This function use to replace the saved cookies atomically."""
+        cookies = [dict(cookie) for cookie in cookies]
+        with self._write_lock():
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cookies, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def get(self, name):
+        """Value of the saved cookie `name`, or None"""
+        return next((cookie["value"] for cookie in self.load() if cookie.get("name") == name), None)
@@ -0,0 +1,152 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Job:
+    """A single solver run; its events can be followed while it executes"""
+
+    def __init__(self, key, params=None):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.params = params or {}
+        self.status = "queued"  # queued -> running -> done | failed
+        self.result = None
+        self.error = None
+        self.events = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def publish(self, event, data):
+        with self._cond:
+            self.events.append({"event": event, "data": data})
+            self._cond.notify_all()
+
+    def _set_status(self, status, result=None, error=None):
+        with self._cond:
+            self.status = status
+            if status in ("done", "failed"):
+                self.result = result
+                self.error = error
+                self.finished_at = time.time()
+                self.events.append({"event": status, "data": self.to_dict(include_result=True)})
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.finished, timeout)
+
+    def follow(self, heartbeat=15):
+        """
+        Yield every event from the start of the job, then new ones as they are
+        published, until the job finishes. Yields None every `heartbeat`
+        seconds without events so streaming responses can keep the connection alive.
+        """
+        index = 0
+        while True:
+            with self._cond:
+                if index >= len(self.events) and not self.finished:
+                    self._cond.wait(heartbeat)
+                pending = self.events[index:]
+                index += len(pending)
+                done = self.finished and index >= len(self.events)
+            if not pending and not done:
+                yield None
+            for event in pending:
+                yield event
+            if done:
+                return
+
+    def to_dict(self, include_result=False):
+        data = {
+            "job_id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "events": len(self.events),
+        }
+        if include_result:
+            data["result"] = self.result
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    """
+    Runs solver jobs on a bounded thread pool.
+
+    `runner(job)` does the work, publishes progress through `job.publish` and
+    returns the job result. Submitting a key that already has a queued or
+    running job returns that job instead of starting a duplicate run.
+    """
+
+    def __init__(self, runner, max_workers=None, max_queued=None, ttl=None):
+        self.runner = runner
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", 2))
+        self.max_queued = max_queued if max_queued is not None else int(os.getenv("JOB_MAX_QUEUED", 20))
+        self.ttl = ttl if ttl is not None else float(os.getenv("JOB_TTL", 3600))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="leetcode-job")
+        self._jobs = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, **params):
+        """
+        Returns:
+        Job: the new or already in-flight job for `key`, or None when the queue is full.
+        """
+        with self._lock:
+            self._prune()
+            job = self._inflight.get(key)
+            if job is not None:
+                return job
+            if sum(1 for j in self._inflight.values() if j.status == "queued") >= self.max_queued:
+                return None
+            job = Job(key, params)
+            self._jobs[job.id] = job
+            self._inflight[key] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def inflight(self, key):
+        """The queued or running job for `key`, or None"""
+        with self._lock:
+            return self._inflight.get(key)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job._set_status("running")
+        try:
+            result = self.runner(job)
+        except Exception as e:
+            print(f"Job {job.id} failed: {str(e)}")
+            self._finish(job, "failed", error=str(e))
+        else:
+            self._finish(job, "done", result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._lock:
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+        job._set_status(status, result=result, error=error)
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL; caller holds the lock"""
+        cutoff = time.time() - self.ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,182 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+STATUSES=("Accepted", "Wrong Answer", "Time Limit Exceeded", "Memory Limit Exceeded", "Output Limit Exceeded",
+          "Runtime Error", "Compile Error")
+STATUS_RE=re.compile("|".join(STATUSES))
+MAX_FIELD_CHARS=400   # Longer inputs/outputs are cut in retry prompts
+MAX_TRACE_LINES=8     # Only the end of a traceback names the failing line and exception
+
+
+def _clip(text, limit=MAX_FIELD_CHARS):
+    text=str(text).strip()
+    return text if len(text)<=limit else f"{text[:limit]} ... [{len(text)-limit} more chars]"
+
+
+def _trace_tail(text):
+    lines=[line for line in str(text).strip().splitlines() if line.strip()]
+    return "\n".join(lines[-MAX_TRACE_LINES:])
+
+
+@dataclass
+class JudgeResult:
+    """Verdict of a LeetCode run/submission or of a local example run"""
+
+    status: str                          # One of STATUSES, or "Unknown"
+    source: str="submit"                 # "run", "submit" or "local"
+    failing_input: Optional[str]=None
+    expected: Optional[str]=None
+    actual: Optional[str]=None
+    error: Optional[str]=None            # Compile error or runtime traceback
+    runtime: Optional[str]=None
+    memory: Optional[str]=None
+    runtime_percentile: Optional[float]=None
+    memory_percentile: Optional[float]=None
+    passed: Optional[int]=None
+    total: Optional[int]=None
+    raw: str=""                          # Full text as shown on LeetCode, for display and the store
+
+    @property
+    def accepted(self):
+        return self.status=="Accepted"
+
+    def to_prompt(self):
+        """
+        This function use to render only the signal the model needs for the next attempt.
+
+        Accepted results keep their counts and runtime/memory; failures keep
+        the verdict, the failing case and the end of the error trace, without
+        page labels, inputs of passing cases or other boilerplate.
+        """
+        lines=[self.status]
+        if self.passed is not None and self.total is not None:
+            lines.append(f"{self.passed} / {self.total} testcases passed")
+        if self.accepted:
+            if self.runtime:
+                lines.append(f"Runtime: {self.runtime}" + (f" (beats {self.runtime_percentile:.2f}%)" if self.runtime_percentile is not None else ""))
+            if self.memory:
+                lines.append(f"Memory: {self.memory}" + (f" (beats {self.memory_percentile:.2f}%)" if self.memory_percentile is not None else ""))
+            return "\n".join(lines)
+        if self.error:
+            lines.append(f"Error:\n{_trace_tail(self.error)}")
+        if self.failing_input:
+            lines.append(f"Input: {_clip(self.failing_input)}")
+        if self.actual is not None:
+            lines.append(f"Output: {_clip(self.actual)}")
+        if self.expected is not None:
+            lines.append(f"Expected: {_clip(self.expected)}")
+        if self.status=="Unknown" and self.raw:
+            lines.append(_clip(self.raw, MAX_FIELD_CHARS*2))
+        return "\n".join(lines)
+
+
+def _case_input(data_input, case, cases):
+    """Lines of `data_input` (all cases, one argument per line) that belong to case `case`"""
+    lines=(data_input or "").split("\n")
+    if not cases or len(lines)%cases:
+        return data_input
+    per_case=len(lines)//cases
+    return "\n".join(lines[case*per_case:(case+1)*per_case])
+
+
+def from_check(result, data_input=None, raw=""):
+    """
+    This function use to build a JudgeResult from the judge's check response.
+
+    Args:
+    result (dict): JSON of /submissions/detail/<id>/check/.
+    data_input (str): test input sent with a run, used to find the failing case.
+    raw (str): formatted text of the result.
+
+    Returns:
+    JudgeResult
+    """
+    is_run="correct_answer" in result
+    status=result.get("status_msg") or "Unknown"
+    if is_run and status=="Accepted" and not result.get("correct_answer"):
+        status="Wrong Answer"  # A run that finished is reported as Accepted even when an answer differs
+    judge=JudgeResult(
+        status=status, source="run" if is_run else "submit", raw=raw,
+        error=result.get("full_compile_error") or result.get("compile_error")
+        or result.get("full_runtime_error") or result.get("runtime_error"),
+        runtime=result.get("status_runtime"), memory=result.get("status_memory"),
+        runtime_percentile=result.get("runtime_percentile"), memory_percentile=result.get("memory_percentile"),
+    )
+    if is_run:
+        outputs=result.get("code_answer") or []
+        expected=result.get("expected_code_answer") or []
+        compare=result.get("compare_result") or ""
+        cases=len(expected)
+        failing=[i for i in range(min(len(outputs), cases))
+                 if (compare[i]=="0" if len(compare)>i else outputs[i]!=expected[i])]
+        if cases:
+            judge.total=cases
+            judge.passed=cases-len(failing) if status in ("Accepted", "Wrong Answer") else None
+        if failing:
+            case=failing[0]
+            judge.failing_input=_case_input(data_input, case, cases)
+            judge.actual=outputs[case]
+            judge.expected=expected[case]
+        elif judge.error:
+            judge.failing_input=result.get("last_testcase") or None
+    else:
+        judge.passed=result.get("total_correct")
+        judge.total=result.get("total_testcases")
+        if not judge.accepted:
+            judge.failing_input=result.get("last_testcase") or None
+            judge.actual=result.get("code_output")
+            judge.expected=result.get("expected_output")
+    return judge
+
+
+def _labelled(text, labels):
+    """Value after a label, either `Label: value` or `Label` on its own line followed by the value"""
+    stops="|".join(["Input", "Last Executed Input", "Output", "Expected", "Stdout", "Case \\d+", "Runtime", "Memory",
+                    "Traceback"])
+    for label in labels:
+        match=re.search(rf"^{label}[ \t]*(?::[ \t]*|\n)(.*?)(?=^(?:{stops})\b|\Z)", text, re.MULTILINE | re.DOTALL)
+        if match and match.group(1).strip():
+            return match.group(1).strip()
+    return None
+
+
+def parse_result_text(text, source="submit"):
+    """
+    This function use to build a JudgeResult from result text.
+
+    Handles the panel text scraped from LeetCode and the messages of the
+    local runner, for when no judge response is available.
+
+    Returns:
+    JudgeResult
+    """
+    text=(text or "").strip()
+    match=STATUS_RE.search(text)
+    judge=JudgeResult(status=match.group(0) if match else "Unknown", source=source, raw=text)
+    counts=re.search(r"(\d+)\s*/\s*(\d+)\s*testcases passed", text)
+    if counts:
+        judge.passed, judge.total=int(counts.group(1)), int(counts.group(2))
+    runtime=re.search(r"Runtime\s*:?\s*([\d.]+ ?ms)(?:.*?beats ([\d.]+)%)?", text)
+    if runtime:
+        judge.runtime=runtime.group(1)
+        judge.runtime_percentile=float(runtime.group(2)) if runtime.group(2) else None
+    memory=re.search(r"Memory\s*:?\s*([\d.]+ ?MB)(?:.*?beats ([\d.]+)%)?", text)
+    if memory:
+        judge.memory=memory.group(1)
+        judge.memory_percentile=float(memory.group(2)) if memory.group(2) else None
+    if judge.accepted:
+        return judge
+    judge.failing_input=_labelled(text, ["Last Executed Input", "Input"])
+    judge.actual=_labelled(text, ["Output"])
+    judge.expected=_labelled(text, ["Expected"])
+    trace=re.search(r"Traceback.*?(?=^(?:Input|Last Executed Input)\b|\Z)", text, re.MULTILINE | re.DOTALL)
+    if trace:
+        judge.error=trace.group(0)
+    elif judge.status in ("Compile Error", "Runtime Error") and match:
+        # Error text follows the verdict up to the failing input
+        judge.error=re.split(r"^(?:Input|Last Executed Input)\b", text[match.end():], maxsplit=1, flags=re.MULTILINE)[0].strip(" :\n") or None
+    elif judge.status in ("Time Limit Exceeded", "Memory Limit Exceeded") and match:
+        judge.error=text[match.end():].split("\n")[0].strip(" :") or None
+    return judge
@@ -0,0 +1,221 @@
+import os
+import time
+import threading
+from datetime import datetime
+from html.parser import HTMLParser
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from cookie_store import CookieStore
+
+load_dotenv()
+
+
+DAILY_QUERY = """
+query questionOfToday {
+    activeDailyCodingChallengeQuestion {
+        link
+        question {
+            title
+            titleSlug
+            content
+            codeSnippets {
+                langSlug
+                code
+            }
+        }
+    }
+}
+"""
+
+QUESTION_QUERY = """
+query questionData($titleSlug: String!) {
+    question(titleSlug: $titleSlug) {
+        title
+        titleSlug
+        content
+        codeSnippets {
+            langSlug
+            code
+        }
+    }
+}
+"""
+
+USER_STATUS_QUERY = """
+query globalData {
+    userStatus {
+        isSignedIn
+        username
+    }
+}
+"""
+
+
+class _TextExtractor(HTMLParser):
+    """Turns LeetCode's question HTML into the plain text the page shows"""
+    BLOCK_TAGS = {"p", "div", "pre", "li", "ul", "ol", "br", "h1", "h2", "h3", "h4"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "sup":
+            self.parts.append("^")
+
+    def handle_endtag(self, tag):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+    def text(self):
+        lines = [line.rstrip() for line in "".join(self.parts).replace("\xa0", " ").splitlines()]
+        text = "\n".join(lines)
+        while "\n\n\n" in text:
+            text = text.replace("\n\n\n", "\n\n")
+        return text.strip()
+
+
+def html_to_text(html):
+    parser = _TextExtractor()
+    parser.feed(html or "")
+    parser.close()
+    return parser.text()
+
+
+class LeetCodeGraphQLClient:
+    """
+    Fetches problem data straight from LeetCode's GraphQL API over a pooled
+    requests.Session, reusing the cookies saved by LeetCodeSessionManager.
+    The browser is then only needed to run and submit code.
+    """
+
+    def __init__(self, base_url=None, cookie_file=None, timeout=10, pool_size=4, auth_ttl=None):
+        self.base_url = (base_url or os.getenv("LEETCODE_BASE_URL", "https://leetcode.com")).rstrip("/")
+        self.cookie_store = CookieStore(cookie_file)
+        self.timeout = timeout
+        self.auth_ttl = auth_ttl if auth_ttl is not None else float(os.getenv("AUTH_CHECK_TTL", 600))
+        self._cookie_mtime = None
+        self._auth_cache = {}  # LEETCODE_SESSION value -> (checked at, signed in)
+        self._lock = threading.Lock()
+
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.http.headers.update({
+            "Content-Type": "application/json",
+            "Referer": f"{self.base_url}/",
+            "Origin": self.base_url,
+        })
+
+    def _load_cookies(self):
+        """(Re)load saved browser cookies when the cookie file has changed"""
+        mtime = self.cookie_store.mtime()
+        if mtime is None:
+            return
+        with self._lock:
+            if mtime == self._cookie_mtime:
+                return
+            cookies = self.cookie_store.load()
+            self.http.cookies.clear()
+            for cookie in cookies:
+                self.http.cookies.set(cookie["name"], cookie["value"],
+                                      domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+                if cookie["name"] == "csrftoken":
+                    self.http.headers["x-csrftoken"] = cookie["value"]
+            self._cookie_mtime = mtime
+
+    def query(self, query, variables=None):
+        """
+        This function use to run a GraphQL query.
+
+        Returns:
+        dict: the `data` field of the response, or None on failure.
+        """
+        try:
+            self._load_cookies()
+            response = self.http.post(
+                f"{self.base_url}/graphql",
+                json={"query": query, "variables": variables or {}},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            result = response.json()
+            if result.get("errors"):
+                print(f"API Error: {result['errors']}")
+                return None
+            return result.get("data")
+        except Exception as e:
+            print(f"GraphQL request failed: {str(e)}")
+            return None
+
+    def is_signed_in(self):
+        """
+        This function use to check the saved login with a single userStatus query.
+
+        The answer is cached for `auth_ttl` seconds per LEETCODE_SESSION
+        cookie, so sessions started within the TTL make no request at all.
+
+        Returns:
+        bool: True when signed in, False when not, None when the check itself failed.
+        """
+        session_cookie = self.cookie_store.get("LEETCODE_SESSION")
+        if not session_cookie:
+            return False
+        with self._lock:
+            checked_at, signed_in = self._auth_cache.get(session_cookie, (None, None))
+        if checked_at is not None and time.monotonic() - checked_at < self.auth_ttl:
+            return signed_in
+        data = self.query(USER_STATUS_QUERY)
+        if data is None:
+            return None  # Network or API problem: do not cache
+        signed_in = bool((data.get("userStatus") or {}).get("isSignedIn"))
+        with self._lock:
+            self._auth_cache[session_cookie] = (time.monotonic(), signed_in)
+        return signed_in
+
+    def _problem(self, question, base_link):
+        templates = {s["langSlug"]: s["code"] for s in question.get("codeSnippets") or []}
+        return {
+            "title": question["title"],
+            "base_link": base_link,
+            "description": html_to_text(question.get("content")),
+            "python_code_template": templates.get("python3", ""),
+        }
+
+    def get_daily_problem(self):
+        """
+        Fetch today's daily problem, its statement and Python3 template in one round trip.
+
+        Returns:
+        dict with url, title, base_link, description and python_code_template, or None.
+        """
+        data = self.query(DAILY_QUERY)
+        if not data or not data.get("activeDailyCodingChallengeQuestion"):
+            return None
+        daily = data["activeDailyCodingChallengeQuestion"]
+        problem = self._problem(daily["question"], daily["link"])
+        today_date = datetime.today().strftime('%Y-%m-%d')
+        problem["url"] = f"{self.base_url}{daily['link']}description/?envType=daily-question&envId={today_date}"
+        return problem
+
+    def get_problem(self, slug):
+        """
+        Fetch a problem's statement and Python3 template by slug.
+
+        Returns:
+        dict with url, title, base_link, description and python_code_template, or None.
+        """
+        data = self.query(QUESTION_QUERY, {"titleSlug": slug})
+        if not data or not data.get("question"):
+            return None
+        base_link = f"/problems/{data['question']['titleSlug']}/"
+        problem = self._problem(data["question"], base_link)
+        problem["url"] = f"{self.base_url}{base_link}description/"
+        return problem
@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def cache_key(model, temperature, prompt):
+    """Content address of a completion: sha256 over model name, temperature and prompt"""
+    payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Memoizes LLM completions: an in-memory LRU in front of a SQLite table that
+    survives restarts and is shared between worker processes.
+
+    Completions older than `ttl` seconds are ignored and evicted, the table is
+    capped at `max_entries` rows (oldest first), and a completion whose code
+    failed can be dropped with discard_code so the next identical prompt asks
+    the model again.
+    """
+
+    def __init__(self, path=None, max_memory_entries=None, enabled=None, ttl=None, max_entries=None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+        self.max_memory_entries = max_memory_entries if max_memory_entries is not None else int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", 256))
+        self.enabled = enabled if enabled is not None else os.getenv("LLM_CACHE", "1") == "1"
+        self.ttl = ttl if ttl is not None else float(os.getenv("LLM_CACHE_TTL_DAYS", 30)) * 86400
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if self.enabled:
+            with self._connect() as conn:
+                conn.execute("""CREATE TABLE IF NOT EXISTS completions (
+                                    key TEXT PRIMARY KEY,
+                                    content TEXT NOT NULL,
+                                    stored_at REAL NOT NULL)""")
+                conn.execute("CREATE INDEX IF NOT EXISTS completions_stored_at ON completions (stored_at)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, content, stored_at):
+        with self._lock:
+            self._memory[key] = (content, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > cutoff:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        with self._connect() as conn:
+            row = conn.execute("SELECT content, stored_at FROM completions WHERE key = ? AND stored_at > ?",
+                               (key, cutoff)).fetchone()
+        with self._lock:
+            if row is None:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, row[0], row[1])
+        return row[0]
+
+    def put(self, key, content):
+        now = time.time()
+        self._remember(key, content, now)
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO completions (key, content, stored_at) VALUES (?, ?, ?)",
+                         (key, content, now))
+        self.evict()
+
+    def evict(self):
+        """Drop expired rows, then the oldest rows beyond `max_entries`"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM completions WHERE stored_at <= ?", (time.time() - self.ttl,))
+            conn.execute(
+                """DELETE FROM completions WHERE key IN (
+                        SELECT key FROM completions ORDER BY stored_at DESC LIMIT -1 OFFSET ?)""",
+                (self.max_entries,)
+            )
+
+    def discard_code(self, code):
+        """
+        This function use to forget every cached completion containing `code`,
+        e.g. after that code failed a test or a submission.
+
+        Returns:
+        int: number of completions dropped.
+        """
+        code = (code or "").strip()
+        if not self.enabled or not code:
+            return 0
+        with self._lock:
+            for key in [key for key, (content, _) in self._memory.items() if code in content]:
+                del self._memory[key]
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM completions WHERE instr(content, ?) > 0", (code,)).rowcount
+
+    def invoke(self, llm, prompt, bypass=False, stream=False, on_token=None, until=None, stop=None):
+        """
+        This function use to call `llm.invoke(prompt)` through the cache.
+
+        Args:
+        llm: chat model.
+        prompt (str): prompt.
+        bypass (bool): skip the lookup and force a fresh completion (the result is still stored).
+        stream (bool): read the completion with `llm.stream(prompt)` instead.
+        on_token (callable): called with each piece of text as it arrives (once with the whole text on a hit).
+        until (callable): given the text streamed so far, returns the index where the
+            completion is complete enough, e.g. the end of the code block; the rest
+            of the stream is abandoned and the text is cut there.
+        stop (threading.Event): once set, the stream is closed and nothing is stored.
+
+        Returns:
+        str: completion content, or None when `stop` was set before it finished.
+        """
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+        key = cache_key(model, getattr(llm, "temperature", None), prompt)
+        if self.enabled and not bypass:
+            content = self.get(key)
+            if content is not None:
+                print("LLM cache hit")
+                if on_token:
+                    on_token(content)
+                return content
+        if stop is not None and stop.is_set():
+            return None
+        if stream:
+            content = self._stream(llm, prompt, on_token, until, stop)
+            if content is None:
+                return None
+        else:
+            content = llm.invoke(prompt).content
+            if on_token:
+                on_token(content)
+        if self.enabled:
+            self.put(key, content)
+        return content
+
+    def _stream(self, llm, prompt, on_token, until, stop=None):
+        content = ""
+        chunks = llm.stream(prompt)
+        try:
+            for chunk in chunks:
+                if stop is not None and stop.is_set():
+                    return None
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                if not text:
+                    continue
+                start = len(content)
+                content += text
+                end = until(content) if until else None
+                if end is not None:
+                    if on_token:
+                        on_token(text[:end - start])
+                    return content[:end]
+                if on_token:
+                    on_token(text)
+        finally:
+            chunks.close()  # Stops generation when the stream was left early
+        return content
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0,
+                    "memory_entries": len(self._memory)}
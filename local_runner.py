@@ -0,0 +1,256 @@
+import os
+import re
+import ast
+import sys
+import json
+import signal
+import tempfile
+import subprocess
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Mirrors the names LeetCode's Python3 environment pre-imports so generated
+# code does not need its own imports.
+PRELUDE = r'''
+import sys, io, json, traceback
+from typing import *
+import collections, heapq, bisect, itertools, functools, math, string, re, operator
+from collections import *
+from heapq import *
+from bisect import *
+from itertools import *
+from functools import *
+from math import *
+
+def _apply_limits(memory_mb, cpu_seconds):
+    # Set here in the child rather than through preexec_fn, which can deadlock a threaded parent
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return
+    memory = memory_mb * 1024 * 1024
+    for limit, values in ((resource.RLIMIT_AS, (memory, memory)), (resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))):
+        try:
+            resource.setrlimit(limit, values)
+        except (ValueError, OSError):
+            pass  # e.g. RLIMIT_AS is not supported on macOS
+'''
+
+# Runs inside the child interpreter.
+HARNESS = PRELUDE + r'''
+_payload = json.loads(sys.stdin.read())
+_apply_limits(_payload["memory_mb"], _payload["cpu_seconds"])
+_out = sys.stdout
+sys.stdout = io.StringIO()
+
+def _report(**result):
+    _out.write(json.dumps(result))
+    _out.flush()
+    sys.exit(0)
+
+def _normalize(value, any_order):
+    if isinstance(value, tuple):
+        value = list(value)
+    if isinstance(value, list):
+        value = [_normalize(v, any_order) for v in value]
+        if any_order:
+            value.sort(key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+def _same(actual, expected):
+    if isinstance(actual, float) or isinstance(expected, float):
+        try:
+            return abs(actual - expected) <= 1e-5
+        except TypeError:
+            return False
+    if isinstance(actual, list) and isinstance(expected, list):
+        return len(actual) == len(expected) and all(_same(a, e) for a, e in zip(actual, expected))
+    return actual == expected
+
+try:
+    exec(compile(_payload["code"], "solution.py", "exec"), globals())
+    _method = getattr(Solution(), _payload["method"])
+except BaseException:
+    _report(status="failed", message="Compile Error:\n" + traceback.format_exc(limit=-1))
+
+for _i, _case in enumerate(_payload["cases"], 1):
+    _args = _case["args"]
+    try:
+        _result = _method(*_args)
+        if _result is None and _args:
+            _result = _args[0]  # "modify in-place" problems
+    except BaseException:
+        _report(status="failed", message=f"Runtime Error on example {_i}:\nInput: {_case['input']}\n" + traceback.format_exc(limit=-1))
+    _any_order = _payload["any_order"]
+    if not _same(_normalize(_result, _any_order), _normalize(_case["expected"], _any_order)):
+        _report(status="failed", message=f"Wrong Answer on example {_i}:\nInput: {_case['input']}\nOutput: {json.dumps(_result)}\nExpected: {_case['output']}")
+
+_report(status="passed", message=f"All {len(_payload['cases'])} examples passed locally.")
+'''
+
+EXAMPLE_RE = re.compile(r"Input:?\s*(.+?)\s*\n\s*Output:?\s*(.+?)\s*(?:\n|$)", re.DOTALL)
+METHOD_RE = re.compile(r"class Solution\b.*?def (\w+)\(\s*self\s*,?(.*?)\)\s*(?:->[^:]*)?:", re.DOTALL)
+UNSUPPORTED_TYPES = ("ListNode", "TreeNode", "Node", "NestedInteger")
+# Statements whose examples show only one of several accepted answers
+MULTIPLE_ANSWERS_RE = re.compile(r"also a valid answer|also valid|return any|any (?:of them|valid|one of)|multiple (?:valid )?(?:answers|solutions)"
+                                 r"|more than one (?:valid )?(?:answer|solution)|any such|any possible", re.IGNORECASE)
+CODE_BLOCK_RE = re.compile(r"```(?:python3?|py)?\s*\n(.*?)```", re.DOTALL)
+
+
+def extract_code(text):
+    """Return the body of the first ```python block, or the text unchanged if there is none"""
+    match = CODE_BLOCK_RE.search(text)
+    return match.group(1).strip() + "\n" if match else text
+
+
+def code_block_end(text):
+    """Index just past the closing fence of the first ```python block, or None while it is still open"""
+    match = CODE_BLOCK_RE.search(text)
+    return match.end() if match else None
+
+
+def _split_top_level(text, sep=","):
+    """Split on `sep` outside brackets and string literals"""
+    parts, depth, quote, current = [], 0, None, ""
+    for ch in text:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += ch
+    parts.append(current)
+    return parts
+
+
+def _parse_literal(text):
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def _parse_assignments(text):
+    """Parse `a = [1,2], b = "x"` into [("a", [1, 2]), ("b", "x")]"""
+    assignments = []
+    for part in _split_top_level(text.replace("\n", " ")):
+        match = re.match(r"\s*(\w+)\s*=\s*(.*)$", part, re.DOTALL)
+        if match:
+            assignments.append([match.group(1), match.group(2)])
+        elif assignments:
+            assignments[-1][1] += "," + part  # comma inside an unquoted value
+        else:
+            raise ValueError(f"Unparseable input: {text}")
+    return [(name, _parse_literal(value)) for name, value in assignments]
+
+
+def parse_method(template):
+    """
+    This function use to find the Solution method and its parameter names in the code template.
+
+    Returns:
+    tuple: (method name, [parameter names]) or None when the template is not a plain Solution class.
+    """
+    match = METHOD_RE.search(template or "")
+    if not match or any(t in template for t in UNSUPPORTED_TYPES):
+        return None
+    params = [p.split(":")[0].strip() for p in _split_top_level(match.group(2)) if p.strip()]
+    return match.group(1), params
+
+
+def parse_examples(description, params):
+    """
+    This function use to extract the examples from a problem description.
+
+    Returns:
+    list of {"input", "output", "args", "expected"} dicts, ordered to match `params`.
+    """
+    cases = []
+    for raw_input, raw_output in EXAMPLE_RE.findall(description or ""):
+        assignments = _parse_assignments(raw_input)
+        names = [name for name, _ in assignments]
+        if sorted(names) == sorted(params):
+            values = dict(assignments)
+            args = [values[name] for name in params]
+        elif len(assignments) == len(params):
+            args = [value for _, value in assignments]
+        else:
+            raise ValueError(f"Example input does not match parameters {params}: {raw_input}")
+        cases.append({
+            "input": raw_input.strip(),
+            "output": raw_output.strip(),
+            "args": args,
+            "expected": _parse_literal(raw_output),
+        })
+    return cases
+
+
+def run_local_tests(code, description, template, timeout=None, memory_mb=None):
+    """
+    This function use to run generated code against the problem's examples in a
+    separate Python process with time and memory limits.
+
+    Args:
+    code (str): generated code, optionally wrapped in a ```python block.
+    description (str): problem statement text.
+    template (str): python code template.
+
+    A wrong answer on a problem that accepts several answers is reported as
+    "skipped", since the expected output is then only one valid answer.
+
+    Returns:
+    dict: {"status": "passed" | "failed" | "skipped", "message": str}
+    """
+    timeout = timeout or float(os.getenv("LOCAL_TEST_TIMEOUT", 10))
+    memory_mb = memory_mb or int(os.getenv("LOCAL_TEST_MEMORY_MB", 512))
+
+    method = parse_method(template)
+    if not method:
+        return {"status": "skipped", "message": "Template is not supported by the local runner."}
+    try:
+        cases = parse_examples(description, method[1])
+    except (ValueError, SyntaxError) as e:
+        return {"status": "skipped", "message": f"Could not parse examples: {str(e)}"}
+    if not cases:
+        return {"status": "skipped", "message": "No examples found in problem description."}
+
+    payload = json.dumps({
+        "code": extract_code(code),
+        "method": method[0],
+        "cases": cases,
+        "any_order": "any order" in description.lower(),
+        "memory_mb": memory_mb,
+        "cpu_seconds": int(timeout) + 1,
+    })
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-I", "-c", HARNESS],
+            input=payload, capture_output=True, text=True,
+            timeout=timeout, cwd=tempfile.gettempdir(),
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "failed", "message": f"Time Limit Exceeded: examples did not finish within {timeout}s locally."}
+
+    try:
+        result = json.loads(completed.stdout)
+    except ValueError:
+        if completed.returncode == -getattr(signal, "SIGXCPU", 0):
+            return {"status": "failed", "message": f"Time Limit Exceeded: examples used more than {int(timeout) + 1}s of CPU locally."}
+        if isinstance(completed.stderr, str) and "MemoryError" in completed.stderr:
+            return {"status": "failed", "message": f"Memory Limit Exceeded: more than {memory_mb}MB used locally."}
+        return {"status": "failed", "message": f"Local run crashed (exit code {completed.returncode}):\n{completed.stderr[-2000:]}"}
+    if result["status"] == "failed" and result["message"].startswith("Wrong Answer") and MULTIPLE_ANSWERS_RE.search(description):
+        # Only LeetCode's checker can tell whether a different answer is also valid
+        return {"status": "skipped", "message": "Problem accepts several answers, example output differs:\n" + result["message"]}
+    return result
@@ -1,232 +1,326 @@
-from langchain_core.messages import AIMessage, HumanMessage, BaseMessage,SystemMessage,ToolMessage
-import os
 from dotenv import load_dotenv
-from langgraph.graph import StateGraph
-from langgraph.prebuilt import ToolNode,tools_condition
-from langgraph.graph import MessagesState, START, END
-from langchain_openai import ChatOpenAI
-from langgraph.types import Command
-from langchain_core.tools.base import InjectedToolCallId
-from typing_extensions import Annotated
-from flask import Flask
-from flask import Flask, render_template
-import markdown
+from flask import Flask, render_template, Response, stream_with_context, abort, request
+import threading
+import time
+import json
+import os
+import sys
+import hashlib
+from datetime import datetime
+from functools import lru_cache
 
 
 load_dotenv()
 
-model_name=os.getenv("MODEL_NAME")
-api_key=os.getenv("API_KEY")
-endpoint=os.getenv("ENDPOINT")
-
 
-from LeetCode import LeetCodeSessionManager
+# Only light modules are imported at startup; langchain/langgraph (agent) and
+# selenium (LeetCode) load on first use or in the warm-up thread below.
+from session_pool import LeetCodeSessionPool
+from jobs import JobManager
+from batch import run_batch, submit_limiter
+from metrics import registry, start_trace, finish_trace
 
 app = Flask(__name__)
 
+
+@lru_cache(maxsize=None)
+def get_solver_graph():
+    """Compiled once per worker and shared by every request"""
+    from agent import build_graph
+    return build_graph()
+
+
+# Warm, authenticated browsers shared by all requests of this worker.
+session_pool=LeetCodeSessionPool()
+
+
+def warm_up():
+    get_solver_graph()
+    session_pool.warm_up()
+
+
+_warm_up_lock=threading.Lock()
+_warm_up_started=False
+
+
+def start_warm_up():
+    """
+    Build the graph and start browsers in the background, once per process.
+
+    Not done at import so CLI commands, scripts importing this module and a
+    preloading gunicorn master (whose threads and browsers would not survive
+    the fork) never launch Chrome; the server starts it on boot or on the
+    first request of each worker instead.
+    """
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started=True
+    threading.Thread(target=warm_up, daemon=True).start()
+
 def markdown_to_html(text):
+    import markdown
     return markdown.markdown(
     text,
     extensions=['fenced_code', 'codehilite']
 )
 
 
-@app.route('/')
-def home():
-    return {"message":"Hello World!!! This is a flask server."}
-
-@app.route("/leetcode")
-def leetcode():
+def serialize_chunk(chunk):
+    """JSON-safe view of a graph stream chunk: {node: {"messages": [...], ...}}"""
+    data={}
+    for node, update in chunk.items():
+        update=dict(update or {})
+        messages=update.get("messages")
+        if messages is not None:
+            if not isinstance(messages, list):
+                messages=[messages]
+            update["messages"]=[
+                {"type": getattr(m, "type", "human"),
+                 "content": getattr(m, "content", m),
+                 "tool_calls": getattr(m, "tool_calls", None) or None}
+                for m in messages
+            ]
+        data[node]=update
+    return data
+
+
+def solve_daily(job):
+    """Job runner: solve today's problem on a pooled browser session and publish every graph chunk"""
+    from langchain_core.messages import HumanMessage
+    from agent import metrics_callback, last_message, resume_or_start
+
+    react_graph=get_solver_graph()
+    chunk={}
+    started=time.time()
+    trace, token=start_trace(job.id, key=job.key)
+    try:
+        with session_pool.session() as session:
+            # Code completions are forwarded to event stream clients as they are generated
+            # A forced re-solve also asks the model again instead of replaying cached completions
+            force=job.params.get("force", False)
+            config={"configurable": {"session": session, "force": force, "bypass_llm_cache": force,
+                                     "submit_limiter": submit_limiter,
+                                     "on_token": lambda text: job.publish("token", {"text": text})},
+                    "callbacks": [metrics_callback]}
+            # One checkpoint thread per day: a run cut short is resumed instead of redone
+            graph_input, config=resume_or_start(react_graph, {"messages": [HumanMessage("Please solve todays leetcode problem")]},
+                                          config, job.key)
+            for chunk in react_graph.stream(graph_input, config):
+                print(chunk)
+                print("---"*50)
+                job.publish("chunk", serialize_chunk(chunk))
+            print(last_message(chunk))
+            print("Done")
+    finally:
+        finish_trace(trace, token)
+    message=last_message(chunk)
+    html=markdown_to_html(message)
+    # A forced run ignores the earlier accepted solution, so only its own acceptance counts
+    cache_daily_result(message, html, since=started if job.params.get("force") else None)
+    return {"message": message, "html": html}
+
+
+def solve_batch(job):
+    """Job runner: solve a list of problems on pooled sessions, publishing one "result" event per problem"""
+    slugs=job.params["slugs"]
+    os.makedirs("batches", exist_ok=True)
+    return run_batch(slugs, get_solver_graph(), session_pool,
+                     workers=min(len(slugs), int(os.getenv("BATCH_WORKERS", 2))),
+                     manifest_file=os.path.join("batches", f"{job.key.replace(':', '-')}.json"),
+                     limiter=submit_limiter,
+                     on_result=lambda result: job.publish("result", result))
+
+
+def run_job(job):
+    if "slugs" in job.params:
+        return solve_batch(job)
+    return solve_daily(job)
+
+
+job_manager=JobManager(run_job, max_workers=session_pool.max_sessions)
+
+def collect_gauges():
+    gauges={
+        "leetcode_sessions_idle": session_pool.stats()["idle"],
+        "leetcode_sessions_live": session_pool.stats()["live"],
+    }
+    agent=sys.modules.get("agent")  # Scrapes must not force the agent import
+    if agent:
+        gauges["leetcode_llm_cache_hits"]=agent.get_llm_cache().hits
+        gauges["leetcode_llm_cache_misses"]=agent.get_llm_cache().misses
+    return gauges
+
+
+registry.register_collector(collect_gauges)
+
+
+def today():
+    return datetime.today().strftime('%Y-%m-%d')
+
+
+def cached_daily_result():
+    """
+    Today's final message and html from the result cache, without a browser or LLM call.
 
-    sys_msg=SystemMessage("""You are a helpful assistant having capability to solve leetcode problems.
-                    You can ask me to solve any leetcode problem.
-                    You have capability to generate code, test code and submit code in leetcode.
-                    If any test case failed or any error occured then you will generate code again.
-                    You will first generate code and you should pass that code for test the code and and if all test cases passed then submit code. If any test case failed or any error occured then again generate the code.
-                    Generate Code -> Test Code -> If passed-> Submit Code->If failed-> Generate Code And so on....
-                    After successfully code submission you will get output. 
-                    
-                    """)
-
-    def extract_problemStatement(state: MessagesState):
-        """
-        This function use to extract problem statement from leetcode using selenium.
-
-        Returns:
-        str: problem statement.
-        str: python code template.
-        """
-        if session:
-            print("Authentication successful!")
-            # Perform authenticated actions
-            # Get daily problem
-            daily_problem = session.get_daily_problem()
-            if daily_problem:
-                print(f"\n📌 Today's Challenge: {daily_problem['title']}")
-                session.driver.get(daily_problem['url'])
-                
-                if session.select_python_language():
-                    session.driver.refresh()
-                    details = session.get_problem_details(daily_problem["base_link"])
-                    if details:
-                        print(f"\n📖 Problem Statement:\n{'-'*50}")
-                        print(details['description'])
-                        
-                        print(f"\n💻 Code Template:\n{'-'*50}")
-                        print(details['python_code_template'])
-
-                        data=f"""problem_statement:\n{details['description']}\n\npython_code_template:\n{details['python_code_template']}"""
-                        return {"messages":data}
-                else:
-                    print("Failed to select Python language")
-                    return Command(update={"messages": [HumanMessage("Failed to select Python language")]},
-                goto="__end__")
-            else:
-                print("Failed to fetch daily problem")
-                return Command(update={"messages": [HumanMessage("Failed to fetch daily problem")]},
-                goto="__end__")
-            
-            input("Press Enter to exit...")
-        else:
-            print("Authentication failed")
-            return Command(update={"messages": [HumanMessage("Authentication failed")]},
-                goto="__end__")
-
-    def generate_code(problem_statement:str,python_code:str):
-        """
-        This function use to generate code from problem statement and python code template.
-
-        Args:
-        problem_statement (str): problem statement.
-        python_code (str): python code template.
-
-        Returns:
-        generated code.
-        """
-        prompt=f"""
-        You have been provided with LeetCode problem statement and python code template.
-        You have to generate code for this problem statement.
-        You have to use python code template to generate code.
-        Result should be a valid python code in following format: ```python [code]```.
-        Problem Statement:
-        {problem_statement}
-
-        Python Code Template:
-        {python_code}
+    Keyed by (problem slug, date); the slug is known once a run has fetched today's problem.
     """
-        code=llm.invoke(prompt)
-        print("Generated Code:\n",code.content)
-        return code.content
+    from agent import get_problem_store
+    store=get_problem_store()
+    slug=store.get_daily_slug(today())
+    result=store.get_result(slug, today()) if slug else None
+    registry.inc("leetcode_result_cache_total", result="hit" if result else "miss")
+    return result
+
 
-    def solve_error(problem_statement:str,error:str,code:str):
-        """
-        This function use to solve error in code.
+def cache_daily_result(message, html, since=None):
+    """
+    Cache a run's output, but only when today's problem was accepted so failures are retried.
 
-        Args:
-        problem_statement (str): problem statement.
-        error (str): error.
-        code (str): code
+    With `since`, the accepted solution must also have been stored after that time,
+    i.e. by the run that produced the output.
+    """
+    from agent import get_problem_store
+    store=get_problem_store()
+    slug=store.get_daily_slug(today())
+    solution=store.get_solution(slug) if slug else None
+    if solution and solution["accepted_on"]==today() and (since is None or solution["stored_at"]>=since):
+        store.put_result(slug, today(), message, html)
 
-        Returns:
-        generated code.
-        """
-        print("In solve error")
 
-        prompt=f"""
-        You have been provided with a problem statement, previous generated code and error.
-        Your task is to update the code to solve the error.
-        Result should be a valid python code in following format: ```python [code]```.
+def invalidate_daily_result():
+    from agent import get_problem_store
+    store=get_problem_store()
+    slug=store.get_daily_slug(today())
+    if slug:
+        store.delete_result(slug, today())
 
-        Problem Statement:
-        {problem_statement}
 
-        Error:
-        {error}
+def submit_daily_job(force=False):
+    """
+    Identical concurrent submissions coalesce onto the one in-flight job for today.
 
-        Previous Python Code:
-        {code}
+    A forced re-solve is refused with 409 while a normal run is in flight,
+    since joining it would drop the force flag and that run would refill the
+    cache that was just invalidated.
     """
-        code=llm.invoke(prompt)
-        print("Solved Error:\n",code.content)
-        return code.content
-
-
-    def test_code(code:str,tool_call_id:Annotated[str,InjectedToolCallId]):
-        """
-        This function use to test the code against test cases in leetcode using selenium.
-
-        Args:
-        code (str): code.
-
-        Returns:
-        test_code_output:error or passed.
-        """
-        print("In test code:\n",code)
-        test_code_response=session.test_generated_code(code)
-        if "Unable to insert code in code editor." in test_code_response or "Code testing failed." in test_code_response:
-            return Command(update={"messages": [ToolMessage(test_code_response,tool_call_id=tool_call_id)]},
-                goto="__end__")
-
-        return test_code_response
-
-    def submit_code(code:str,tool_call_id:Annotated[str,InjectedToolCallId]):
-        """
-        This function use to submit code in leetcode using selenium.
-
-        Args:
-        code (str): code.
-
-        Returns:
-        output
-        """
-        print("In submit code")
-        submit_code_response = session.submit_generated_code()
-        if "Code submission failed." in submit_code_response:
-            return Command(update={"messages": [ToolMessage(submit_code_response,tool_call_id=tool_call_id)]},
-                goto="__end__")
-        return submit_code_response
-
-    def assistant(state: MessagesState):
-        res=llm_with_tools.invoke([sys_msg]+state["messages"])
-        print(res)
-        return {"messages": res}
-
-    llm=ChatOpenAI(
-        model=model_name,
-        api_key=api_key,
-        temperature=0.3,
-        base_url=endpoint
-    )
-
-    tools=[generate_code,test_code,submit_code,solve_error]
-    llm_with_tools=llm.bind_tools(tools)
-
-    builder = StateGraph(MessagesState)
-    builder.add_node("Extract_Problem",extract_problemStatement)
-    builder.add_node("assistant", assistant)
-    builder.add_node("tools", ToolNode(tools))
-    builder.add_edge(START, "Extract_Problem")
-    builder.add_edge("Extract_Problem", "assistant")
-    builder.add_conditional_edges(
-        "assistant", tools_condition
-    )
-    builder.add_edge("tools", "assistant")
-
-    react_graph=builder.compile()
-    react_graph.get_graph().draw_mermaid_png(output_file_path="./leetcode.png")
-    print(react_graph.get_graph().draw_mermaid())
-
-
-    with LeetCodeSessionManager() as session:
-        for chunk in react_graph.stream({"messages": [HumanMessage("Please solve todays leetcode problem")]}):
-            print(chunk)
-            print("---"*50)
-        print(chunk["assistant"]["messages"].content)
-        print("Done")
-    message=chunk["assistant"]["messages"].content
-    html_message = markdown_to_html(message)
-    return render_template("solution.html", message=html_message)
+    key=f"daily:{today()}"
+    if force:
+        running=job_manager.inflight(key)
+        if running is not None and not running.params.get("force"):
+            abort(409, description="Today's run is already in progress, retry with force once it has finished")
+        invalidate_daily_result()
+    job=job_manager.submit(key, force=force)
+    if job is None:
+        abort(429, description="Too many queued jobs")
+    return job
+
+
+def force_requested():
+    return request.args.get("force", "").lower() in ("1", "true", "yes")
+
+
+def submit_batch_job(slugs):
+    if not isinstance(slugs, list) or not slugs or not all(isinstance(slug, str) and slug for slug in slugs):
+        abort(400, description="Expected a JSON body like {\"slugs\": [\"two-sum\", ...]}")
+    slugs=list(dict.fromkeys(slugs))
+    digest=hashlib.sha256("\n".join(slugs).encode("utf-8")).hexdigest()[:16]
+    job=job_manager.submit(f"batch:{digest}", slugs=slugs)
+    if job is None:
+        abort(429, description="Too many queued jobs")
+    return job
+
+
+def event_stream(events):
+    """Server-sent events response; None items become keep-alive comments"""
+    def stream():
+        for event in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+    return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def get_job_or_404(job_id):
+    job=job_manager.get(job_id)
+    if job is None:
+        abort(404, description="Unknown job")
+    return job
+
+
+@app.before_request
+def warm_up_on_first_request():
+    start_warm_up()
+
+
+@app.route('/')
+def home():
+    return {"message":"Hello World!!! This is a flask server."}
+
+@app.route("/metrics")
+def metrics():
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/leetcode")
+def leetcode():
+    # ?force=1 drops today's cached result and solves again
+    force=force_requested()
+    if not force:
+        result=cached_daily_result()
+        if result:
+            return render_template("solution.html", message=result["html"])
+    # Runs through the job queue so identical concurrent requests share one run
+    job=submit_daily_job(force)
+    job.wait()
+    if job.status=="failed":
+        return render_template("solution.html", message=markdown_to_html(f"Run failed: {job.error}")), 500
+    return render_template("solution.html", message=job.result["html"])
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    job=submit_daily_job(force_requested())
+    return job.to_dict(), 202
+
+@app.route("/batch", methods=["POST"])
+def create_batch():
+    job=submit_batch_job((request.get_json(silent=True) or {}).get("slugs"))
+    return job.to_dict(), 202
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    return get_job_or_404(job_id).to_dict()
+
+@app.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    job=get_job_or_404(job_id)
+    if not job.finished:
+        return job.to_dict(), 202
+    return job.to_dict(include_result=True), 200 if job.status=="done" else 500
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    return event_stream(get_job_or_404(job_id).follow())
+
+@app.route("/leetcode/stream")
+def leetcode_stream():
+    # Same run as /leetcode, as events: "token" while code is generated, "chunk" per graph step, then "done"
+    force=force_requested()
+    if not force:
+        result=cached_daily_result()
+        if result:
+            return event_stream([{"event": "done", "data": {"status": "done", "cached": True, "result": result}}])
+    return event_stream(submit_daily_job(force).follow())
+
+@app.cli.command("draw-graph")
+def draw_graph():
+    """Render the agent graph to leetcode.png and print its mermaid source."""
+    get_solver_graph().get_graph().draw_mermaid_png(output_file_path="./leetcode.png")
+    print(get_solver_graph().get_graph().draw_mermaid())
 
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000)
-    
+    start_warm_up()
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+MAX_TRACE_SPANS = 2000
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{str(value)}"'.replace("\n", " ") for key, value in labels)
+    return "{" + pairs + "}"
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process Prometheus registry: counters and histograms keyed by
+    label tuples, rendered in the text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # name -> {labels: value}
+        self._histograms = {}  # name -> {labels: [bucket counts..., sum, count]}
+        self._help = {}
+        self._collectors = []
+
+    def describe(self, metric, kind, text):
+        self._help[metric] = (kind, text)
+
+    def inc(self, metric, value=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(metric, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, metric, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(metric, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * len(DURATION_BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def register_collector(self, collector):
+        """`collector()` returns {metric name: value} gauges sampled at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                kind, text = self._help.get(name, ("counter", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} counter"]
+                for labels, value in series.items():
+                    lines.append(f"{name}{_label_text(labels)} {value}")
+            for name, series in self._histograms.items():
+                kind, text = self._help.get(name, ("histogram", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+                for labels, state in series.items():
+                    for bound, count in zip(DURATION_BUCKETS, state):
+                        lines.append(f"{name}_bucket{_label_text(labels + (('le', bound),))} {count}")
+                    lines.append(f"{name}_bucket{_label_text(labels + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_label_text(labels)} {state[-2]}")
+                    lines.append(f"{name}_count{_label_text(labels)} {state[-1]}")
+        for collector in self._collectors:
+            try:
+                for name, value in collector().items():
+                    lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+            except Exception as e:
+                print(f"Metrics collector failed: {str(e)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.describe("leetcode_stage_duration_seconds", "histogram", "Duration of graph nodes, tool calls, browser waits and LLM calls")
+registry.describe("leetcode_stage_errors_total", "counter", "Stages that raised an exception")
+registry.describe("leetcode_llm_tokens_total", "counter", "Prompt and completion tokens used by LLM calls")
+registry.describe("leetcode_result_cache_total", "counter", "/leetcode requests served from (hit) or missing (miss) the daily result cache")
+
+
+class Trace:
+    """Spans recorded during one solver run, written out as JSON when the run ends"""
+
+    def __init__(self, run_id, **attrs):
+        self.run_id = run_id
+        self.attrs = attrs
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, kind, name, start, duration, error=False, **attrs):
+        with self._lock:
+            if len(self.spans) < MAX_TRACE_SPANS:
+                self.spans.append({"kind": kind, "name": name, "start": round(start - self._start, 4),
+                                   "duration": round(duration, 4), "error": error, **attrs})
+
+    def to_dict(self):
+        with self._lock:
+            return {"run_id": self.run_id, "started_at": self.started_at,
+                    "duration": round(time.perf_counter() - self._start, 4),
+                    **self.attrs, "spans": list(self.spans)}
+
+
+_current_trace = contextvars.ContextVar("leetcode_trace", default=None)
+
+
+def start_trace(run_id, **attrs):
+    """Start collecting spans of the current context into a new trace"""
+    trace = Trace(run_id, **attrs)
+    return trace, _current_trace.set(trace)
+
+
+def finish_trace(trace, token, trace_dir=None):
+    """Stop collecting and write the trace to TRACE_DIR/<run_id>.json (disabled when TRACE_DIR is empty)"""
+    _current_trace.reset(token)
+    trace_dir = os.getenv("TRACE_DIR", "traces") if trace_dir is None else trace_dir
+    if not trace_dir:
+        return None
+    os.makedirs(trace_dir, exist_ok=True)
+    path = os.path.join(trace_dir, f"{trace.run_id}.json")
+    with open(path, "w") as f:
+        json.dump(trace.to_dict(), f, indent=2, default=str)
+    return path
+
+
+def record(kind, name, start, duration, error=False, **attrs):
+    """Record a finished stage in the metrics and, if one is active, the current trace"""
+    registry.observe("leetcode_stage_duration_seconds", duration, kind=kind, name=name)
+    if error:
+        registry.inc("leetcode_stage_errors_total", kind=kind, name=name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(kind, name, start, duration, error=error, **attrs)
+
+
+@contextmanager
+def span(kind, name, **attrs):
+    start = time.perf_counter()
+    error = False
+    try:
+        yield attrs
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record(kind, name, start, time.perf_counter() - start, error=error, **attrs)
+
+
+def timed(kind, name=None):
+    """Decorator form of `span`; the span is named after the function by default"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
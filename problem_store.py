@@ -0,0 +1,188 @@
+import os
+import time
+import sqlite3
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    slug TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    base_link TEXT NOT NULL,
+    description TEXT NOT NULL,
+    python_code_template TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS problems_accessed_at ON problems (accessed_at);
+
+CREATE TABLE IF NOT EXISTS solutions (
+    slug TEXT PRIMARY KEY,
+    code TEXT NOT NULL,
+    result TEXT NOT NULL,
+    accepted_on TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_accessed_at ON solutions (accessed_at);
+
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    slug TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    slug TEXT NOT NULL,
+    day TEXT NOT NULL,
+    message TEXT NOT NULL,
+    html TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (slug, day)
+);
+"""
+
+
+def slug_from_link(base_link):
+    """'/problems/two-sum/' -> 'two-sum'"""
+    return base_link.strip("/").split("/")[-1]
+
+
+class ProblemStore:
+    """
+    On-disk SQLite store of problem details and accepted solutions keyed by slug.
+
+    WAL journaling and a busy timeout make it safe to share between threads and
+    gunicorn worker processes. Entries older than their TTL are ignored and
+    evicted, and each table is capped at `max_entries` rows (least recently
+    used rows go first).
+    """
+
+    def __init__(self, path=None, problem_ttl=None, solution_ttl=None, max_entries=None):
+        self.path = path or os.getenv("STORE_PATH", "leetcode_store.db")
+        self.problem_ttl = problem_ttl if problem_ttl is not None else float(os.getenv("PROBLEM_TTL_DAYS", 30)) * 86400
+        self.solution_ttl = solution_ttl if solution_ttl is not None else float(os.getenv("SOLUTION_TTL_DAYS", 365)) * 86400
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("STORE_MAX_ENTRIES", 5000))
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """One connection per thread; sqlite3 connections must not be shared across threads"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_problem(self, slug):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM problems WHERE slug = ? AND stored_at > ?",
+                (slug, now - self.problem_ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE problems SET accessed_at = ? WHERE slug = ?", (now, slug))
+        return {key: row[key] for key in ("title", "url", "base_link", "description", "python_code_template")}
+
+    def put_problem(self, problem):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO problems (slug, title, url, base_link, description, python_code_template, stored_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(slug) DO UPDATE SET
+                       title = excluded.title, url = excluded.url, base_link = excluded.base_link,
+                       description = excluded.description, python_code_template = excluded.python_code_template,
+                       stored_at = excluded.stored_at, accessed_at = excluded.accessed_at""",
+                (slug_from_link(problem["base_link"]), problem["title"], problem["url"], problem["base_link"],
+                 problem["description"], problem["python_code_template"], now, now)
+            )
+        self.evict()
+
+    def get_daily_slug(self, day):
+        with self._connect() as conn:
+            row = conn.execute("SELECT slug FROM daily WHERE day = ?", (day,)).fetchone()
+        return row["slug"] if row else None
+
+    def put_daily_slug(self, day, slug):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO daily (day, slug) VALUES (?, ?)", (day, slug))
+
+    def get_solution(self, slug):
+        """
+        Returns:
+        dict with code, result, accepted_on (YYYY-MM-DD) and stored_at, or None.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT code, result, accepted_on, stored_at FROM solutions WHERE slug = ? AND stored_at > ?",
+                (slug, now - self.solution_ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE solutions SET accessed_at = ? WHERE slug = ?", (now, slug))
+        return dict(row)
+
+    def put_solution(self, slug, code, result, accepted_on):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO solutions (slug, code, result, accepted_on, stored_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (slug, code, result, accepted_on, now, now)
+            )
+        self.evict()
+
+    def delete_solution(self, slug):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM solutions WHERE slug = ?", (slug,))
+
+    def get_result(self, slug, day):
+        """
+        Returns:
+        dict with the final message and its rendered html for (slug, day), or None.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT message, html FROM results WHERE slug = ? AND day = ?", (slug, day)).fetchone()
+        return dict(row) if row else None
+
+    def put_result(self, slug, day, message, html):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (slug, day, message, html, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (slug, day, message, html, time.time())
+            )
+        self.evict()
+
+    def delete_result(self, slug, day):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results WHERE slug = ? AND day = ?", (slug, day))
+
+    def evict(self):
+        """Drop expired rows, then the least recently used rows beyond `max_entries`"""
+        now = time.time()
+        with self._connect() as conn:
+            for table, ttl in (("problems", self.problem_ttl), ("solutions", self.solution_ttl)):
+                conn.execute(f"DELETE FROM {table} WHERE stored_at <= ?", (now - ttl,))
+                conn.execute(
+                    f"""DELETE FROM {table} WHERE slug IN (
+                            SELECT slug FROM {table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)""",
+                    (self.max_entries,)
+                )
+            conn.execute("DELETE FROM daily WHERE day NOT IN (SELECT day FROM daily ORDER BY day DESC LIMIT ?)",
+                         (self.max_entries,))
+            conn.execute(
+                """DELETE FROM results WHERE rowid IN (
+                        SELECT rowid FROM results ORDER BY day DESC, stored_at DESC LIMIT -1 OFFSET ?)""",
+                (self.max_entries,)
+            )
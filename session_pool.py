@@ -0,0 +1,146 @@
+import os
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _new_leetcode_session():
+    # Selenium and undetected_chromedriver are only imported once a browser is needed
+    from LeetCode import LeetCodeSessionManager
+    return LeetCodeSessionManager()
+
+
+class LeetCodeSessionPool:
+    """
+    Keeps a set of authenticated LeetCodeSessionManager instances warm so that
+    requests borrow a ready browser instead of launching Chrome and logging in.
+
+    Sessions are health checked on checkout and recycled after `max_uses` runs
+    or `max_age` seconds. At most `max_sessions` browsers are alive at once;
+    callers block (up to `checkout_timeout` seconds) when all of them are busy.
+    """
+
+    def __init__(self, size=None, max_sessions=None, max_uses=None, max_age=None,
+                 checkout_timeout=None, session_factory=_new_leetcode_session):
+        self.size = size if size is not None else int(os.getenv("SESSION_POOL_SIZE", 1))
+        self.max_sessions = max_sessions if max_sessions is not None else int(os.getenv("SESSION_POOL_MAX", max(self.size, 2)))
+        self.max_uses = max_uses if max_uses is not None else int(os.getenv("SESSION_MAX_USES", 25))
+        self.max_age = max_age if max_age is not None else float(os.getenv("SESSION_MAX_AGE", 1800))
+        self.checkout_timeout = checkout_timeout if checkout_timeout is not None else float(os.getenv("SESSION_CHECKOUT_TIMEOUT", 300))
+        self.session_factory = session_factory
+
+        self._idle = []  # LIFO so the most recently used (warmest) session is reused first
+        self._live = 0   # Sessions that exist, idle or checked out, including ones being started
+        self._closed = False
+        self._cond = threading.Condition()
+        atexit.register(self.close)
+
+    def warm_up(self):
+        """Start sessions until `size` are idle (bounded by `max_sessions`)"""
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= self.size or self._live >= self.max_sessions:
+                    return
+                self._live += 1
+            session = self._create()
+            if session is None:
+                return
+            self._release(session)
+
+    def checkout(self, timeout=None):
+        """
+        Borrow a healthy session from the pool.
+
+        Returns:
+        LeetCodeSessionManager, or None when no session could be started or
+        none became free within the timeout.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            session = None
+            with self._cond:
+                while not self._idle and self._live >= self.max_sessions:
+                    remaining = deadline - time.monotonic()
+                    if self._closed or remaining <= 0:
+                        print("No LeetCode session available")
+                        return None
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return None
+                if self._idle:
+                    session = self._idle.pop()
+                else:
+                    self._live += 1
+
+            if session is None:
+                return self._create()
+            if not self._is_expired(session) and session.is_healthy():
+                return session
+            print("Recycling stale LeetCode session")
+            self._discard(session)
+
+    def checkin(self, session):
+        """Return a borrowed session; worn-out sessions are closed instead of reused"""
+        session.uses += 1
+        if self._is_expired(session) or not session.is_healthy():
+            self._discard(session)
+        else:
+            self._release(session)
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Context manager form of checkout/checkin, yields None on failure like LeetCodeSessionManager"""
+        session = self.checkout(timeout)
+        try:
+            yield session
+        finally:
+            if session is not None:
+                self.checkin(session)
+
+    def close(self):
+        """Shut down every idle session; checked out sessions are closed on checkin"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for session in idle:
+            self._discard(session)
+
+    def stats(self):
+        with self._cond:
+            return {"idle": len(self._idle), "live": self._live, "max_sessions": self.max_sessions}
+
+    def _create(self):
+        """Start a new session; the caller must already have reserved a slot in `_live`"""
+        session = self.session_factory()
+        if session.start_session():
+            return session
+        print("Failed to start pooled LeetCode session")
+        session.close()
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+        return None
+
+    def _release(self, session):
+        with self._cond:
+            if not self._closed:
+                self._idle.append(session)
+                self._cond.notify()
+                return
+        self._discard(session)
+
+    def _discard(self, session):
+        session.close()
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def _is_expired(self, session):
+        return (session.uses >= self.max_uses
+                or time.monotonic() - session.created_at >= self.max_age)